@@ -0,0 +1,9 @@
+# Configuración de gunicorn (se lee automáticamente desde el directorio de trabajo).
+# Las opciones de línea de comandos del Procfile tienen prioridad.
+
+
+def post_worker_init(worker):
+    """Precompile templates and load the offering catalog in each new worker."""
+    from reservas.warmup import warm_up
+    count = warm_up()
+    worker.log.info('Worker %s precalentado (%d plantillas)', worker.pid, count)
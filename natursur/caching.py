@@ -0,0 +1,140 @@
+"""Configuración de la caché a partir de `CACHE_URL` y caché de páginas anónimas.
+
+Ejemplos:
+    locmem://                                (por defecto, un almacén por proceso)
+    file:///var/tmp/natursur_cache           (compartida entre workers de una máquina)
+    redis://localhost:6379/1                 (compartida entre máquinas; requiere `redis`)
+
+`cache_anonymous_page` guarda la respuesta completa de páginas que no dependen
+del usuario. La clave es la ruta más los parámetros GET que la vista declara
+usar: el resto se ignora, así que valores arbitrarios en la URL no crean
+entradas nuevas. Las claves incluyen una generación (`PAGE_GENERATION_KEY`)
+que `python manage.py clear_page_cache` incrementa en cada despliegue; con una
+caché propia de cada proceso no hace falta, porque se vacía al reiniciar.
+"""
+import functools
+import hashlib
+import uuid
+from urllib.parse import unquote, urlencode, urlsplit
+
+from django.core.exceptions import ImproperlyConfigured
+
+PAGE_GENERATION_KEY = 'natursur:page_generation'
+# Backends whose entries live in each worker process and die with it
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+# Besides the session cookie, requests carrying these may render per-visitor content
+PERSONAL_COOKIES = ('messages',)
+
+
+def parse_cache_url(url, base_dir, timeout=300, key_prefix=''):
+    """Translate a cache URL into a Django CACHES entry."""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme in ('', 'locmem'):
+        config = {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': parts.netloc or 'natursur',
+        }
+    elif scheme == 'file':
+        path = unquote(parts.netloc + parts.path)
+        if not path:
+            raise ImproperlyConfigured('CACHE_URL: falta la ruta del directorio de caché')
+        # file:///abs/path is absolute, file://relative/path is relative to BASE_DIR
+        config = {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': path if path.startswith('/') else str(base_dir / path),
+        }
+    elif scheme in ('redis', 'rediss'):
+        config = {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': url,
+        }
+    elif scheme == 'dummy':
+        config = {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+    else:
+        raise ImproperlyConfigured(f'CACHE_URL: esquema no soportado "{parts.scheme}"')
+    config['TIMEOUT'] = timeout
+    config['KEY_PREFIX'] = key_prefix
+    return config
+
+
+def page_generation():
+    from django.core.cache import cache
+    generation = cache.get(PAGE_GENERATION_KEY)
+    if generation is None:
+        cache.add(PAGE_GENERATION_KEY, uuid.uuid4().hex[:8], None)
+        generation = cache.get(PAGE_GENERATION_KEY)
+    return generation
+
+
+def is_shared_cache(alias='default'):
+    """True when the cache outlives the worker processes (file, redis...)."""
+    from django.conf import settings
+    return settings.CACHES[alias]['BACKEND'] not in PROCESS_LOCAL_BACKENDS
+
+
+def clear_page_cache():
+    """Start a new page generation: every cached page is ignored from now on
+    (old entries simply expire). Returns the new generation.
+    """
+    from django.core.cache import cache
+    generation = uuid.uuid4().hex[:8]
+    cache.set(PAGE_GENERATION_KEY, generation, None)
+    return generation
+
+
+def page_cache_key(request, query_params=()):
+    """Key for the page at `request`'s path; only the GET params listed in
+    `query_params` (sorted) take part, any other is ignored.
+    """
+    query = urlencode(sorted((k, v) for k in query_params for v in request.GET.getlist(k)))
+    # Host is checked against ALLOWED_HOSTS, so it can't add unbounded keys either
+    url = f'{request.scheme}://{request.get_host()}{request.path}?{query}'
+    return f'natursur:page:{page_generation()}:{hashlib.md5(url.encode()).hexdigest()}'
+
+
+def _is_personal(request):
+    from django.conf import settings
+    cookies = {settings.SESSION_COOKIE_NAME, *PERSONAL_COOKIES}
+    return request.method not in ('GET', 'HEAD') or any(name in request.COOKIES for name in cookies)
+
+
+def cache_anonymous_page(view=None, *, query_params=()):
+    """Serve `view` from the cache to visitors without a session.
+
+    Logged-in users (and anyone with a session or pending messages) get a
+    fresh render. Responses always carry `Vary: Cookie` so shared caches
+    never hand the anonymous page to a logged-in user. Timeout:
+    settings.PAGE_CACHE_SECONDS. A view that reads GET params lists them in
+    `query_params` (`@cache_anonymous_page(query_params=('page',))`); any
+    other param shares the cached page of the bare path.
+    """
+    if view is None:
+        return functools.partial(cache_anonymous_page, query_params=query_params)
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        from django.conf import settings
+        from django.core.cache import cache
+        from django.utils.cache import patch_vary_headers
+
+        if _is_personal(request):
+            response = view(request, *args, **kwargs)
+            patch_vary_headers(response, ('Cookie',))
+            return response
+
+        key = page_cache_key(request, query_params)
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = view(request, *args, **kwargs)
+        patch_vary_headers(response, ('Cookie',))
+        # Responses that set cookies (or will get a CSRF cookie) are per-visitor
+        if (response.status_code == 200 and not response.streaming and not response.cookies
+                and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')):
+            cache.set(key, response, settings.PAGE_CACHE_SECONDS)
+        return response
+    return wrapper
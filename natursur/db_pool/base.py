@@ -0,0 +1,60 @@
+"""PostgreSQL backend that reuses psycopg2 connections from a per-process pool.
+
+Enable it with `DB_POOL=true` (see `natursur/database.py`). Each gunicorn
+worker keeps up to `pool_max_size` open connections; Django closes its
+connection at the end of every request as usual, which hands it back to the
+pool instead of disconnecting.
+"""
+import os
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+from psycopg2 import extras, pool as pg_pool
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.pool_max_size = int(params.pop('pool_max_size', 10))
+        return params
+
+    def _get_pool(self, conn_params):
+        # Keyed by pid: a pool must never be shared across forked workers
+        key = (self.alias, os.getpid())
+        with _pools_lock:
+            connection_pool = _pools.get(key)
+            if connection_pool is None:
+                connection_pool = _pools[key] = pg_pool.ThreadedConnectionPool(
+                    1, self.pool_max_size, **conn_params
+                )
+        return connection_pool
+
+    @base.async_unsafe
+    def get_new_connection(self, conn_params):
+        isolation_level = self.settings_dict['OPTIONS'].get('isolation_level')
+        try:
+            self.isolation_level = base.IsolationLevel(
+                base.IsolationLevel.READ_COMMITTED if isolation_level is None else isolation_level
+            )
+        except ValueError:
+            raise ImproperlyConfigured(f'Invalid transaction isolation level {isolation_level} specified.')
+        self._pool = self._get_pool(conn_params)
+        connection = self._pool.getconn()
+        if connection.closed:
+            self._pool.putconn(connection, close=True)
+            connection = self._pool.getconn()
+        if isolation_level is not None:
+            connection.isolation_level = self.isolation_level
+        extras.register_default_jsonb(conn_or_curs=connection, loads=lambda x: x)
+        return connection
+
+    @base.async_unsafe
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                # putconn rolls back an open transaction and discards broken connections
+                self._pool.putconn(self.connection, close=bool(self.connection.closed))
@@ -0,0 +1,14 @@
+"""SQLite backend that opens transactions with BEGIN IMMEDIATE.
+
+With the default deferred BEGIN a transaction that reads and then writes
+(update_or_create, select_for_update, the booking signals...) has to upgrade
+its lock halfway through; if another worker wrote in the meantime SQLite
+fails at once with "database is locked" instead of waiting busy_timeout.
+Taking the write lock up front makes concurrent writers queue instead.
+"""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute('BEGIN IMMEDIATE')
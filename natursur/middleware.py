@@ -0,0 +1,160 @@
+import logging
+import re
+import zlib
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.text import compress_string
+
+from natursur.database import REPLICA_ALIAS, pin_to_primary
+from natursur.querybudget import QueryBudgetExceeded, QueryRecorder
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+logger = logging.getLogger('natursur.queries')
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+COMPRESSIBLE_TYPES = (
+    'text/html', 'text/plain', 'text/css', 'text/csv', 'text/javascript',
+    'application/json', 'application/javascript', 'application/xml', 'image/svg+xml',
+)
+# Same length-hiding as Django's GZipMiddleware ("Heal the Breach")
+GZIP_MAX_RANDOM_BYTES = 100
+# Brotli quality for dynamic responses (11 is for pre-compressed static files)
+BROTLI_QUALITY = 5
+
+
+class PrimaryPinningMiddleware:
+    """After a write request, keep the session reading from the primary for a
+    few seconds so it never sees a replica that has not caught up yet.
+    Only active when a replica is configured (the read-only SQLite alias reads
+    the same file and has no lag).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            request.method not in SAFE_METHODS
+            and getattr(settings, 'READ_DATABASE_ALIAS', None) == REPLICA_ALIAS
+            and hasattr(request, 'session')
+        ):
+            pin_to_primary(request, settings.REPLICA_PIN_SECONDS)
+        return response
+
+
+class ConditionalGetMiddleware:
+    """Weak ETag for GET/HEAD responses that have none and 304 when it
+    matches `If-None-Match` (also for ETags set by the view).
+
+    The tag is length + CRC32 of the body: much cheaper than Django's MD5 and
+    enough for a weak validator. Pages with a CSRF token change on every
+    render (the token is masked), so only token-free pages and JSON get 304s.
+    Must sit below CompressionMiddleware so the tag describes the identity body.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in ('GET', 'HEAD') or response.streaming:
+            return response
+        if response.status_code == 200 and not response.has_header('ETag') and 'no-store' not in response.get('Cache-Control', ''):
+            content = response.content
+            response.headers['ETag'] = f'W/"{len(content):x}-{zlib.crc32(content):08x}"'
+        if response.has_header('ETag'):
+            return get_conditional_response(request, etag=response['ETag'], response=response)
+        return response
+
+
+def _has_secrets(request):
+    # A CSRF token was rendered (get_token/rotate_token leave this key) or the session may show personal data
+    return 'CSRF_COOKIE_NEEDS_UPDATE' in request.META or settings.SESSION_COOKIE_NAME in request.COOKIES
+
+
+class CompressionMiddleware:
+    """Brotli or gzip for HTML/JSON/text responses of at least
+    settings.COMPRESSION_MIN_BYTES.
+
+    BREACH: responses that may carry a secret next to reflected input (a CSRF
+    token was rendered, or the visitor has a session) are only gzipped, with a
+    random-length header like Django's GZipMiddleware; Django masks the CSRF
+    token differently on every response too. Brotli has no such padding, so it
+    is used only for anonymous, token-free responses. Streaming responses
+    (server-sent events, CSV exports) are left alone.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        content_type = response.get('Content-Type', '').split(';')[0].strip()
+        if (
+            response.streaming
+            or content_type not in COMPRESSIBLE_TYPES
+            or response.has_header('Content-Encoding')
+            or len(response.content) < settings.COMPRESSION_MIN_BYTES
+        ):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        accepted = request.headers.get('Accept-Encoding', '')
+        if brotli is not None and re.search(r'\bbr\b', accepted) and not _has_secrets(request):
+            encoding, compressed = 'br', brotli.compress(response.content, quality=BROTLI_QUALITY)
+        elif re.search(r'\bgzip\b', accepted):
+            encoding, compressed = 'gzip', compress_string(response.content, max_random_bytes=GZIP_MAX_RANDOM_BYTES)
+        else:
+            return response
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        response.headers['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # A compressed body is only weakly equivalent to the identity one (RFC 9110 8.8.1)
+            response.headers['ETag'] = 'W/' + etag
+        return response
+
+
+class QueryBudgetMiddleware:
+    """Count the SQL queries of each request (development/staging).
+
+    Adds `Server-Timing: db;dur=...` so the numbers show up in the browser dev
+    tools, and logs to `natursur.queries` (with the project stack of the
+    offending queries) when a view exceeds its budget
+    (settings.QUERY_BUDGETS by URL name, else QUERY_BUDGET_DEFAULT) or runs
+    the same query shape QUERY_BUDGET_DUPLICATES times or more (N+1). With
+    QUERY_BUDGET_STRICT it raises QueryBudgetExceeded instead, so tests fail.
+    Queries run while a streaming response is consumed are not counted.
+    Disabled unless settings.QUERY_BUDGET_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_BUDGET_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with recorder.record():
+            response = self.get_response(request)
+        response.headers['Server-Timing'] = f'db;dur={recorder.duration_ms:.1f};desc="{recorder.count} SQL"'
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else None
+        budget = settings.QUERY_BUDGETS.get(view, settings.QUERY_BUDGET_DEFAULT)
+        problems = recorder.report(f'{request.method} {request.path} ({view})', budget, settings.QUERY_BUDGET_DUPLICATES)
+        if problems:
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(problems)
+            logger.warning(problems)
+        return response
@@ -0,0 +1,91 @@
+"""Presupuesto de consultas SQL por petición y detector de N+1.
+
+`QueryRecorder` se instala con `execute_wrapper` en todas las conexiones
+mientras dura la petición (no necesita `DEBUG` ni `connection.queries`) y
+guarda cada consulta con su forma (el SQL con parámetros, con las listas
+`IN (...)` colapsadas), su duración y la pila de llamadas del proyecto la
+primera vez que aparece. Si una misma forma se repite muchas veces es casi
+seguro un N+1: una consulta por fila dentro de un bucle.
+"""
+import re
+import time
+import traceback
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from django.db import connections
+
+PROJECT_DIR = str(Path(__file__).resolve().parent.parent)
+# Frames kept in the stack of each query shape (innermost last)
+STACK_DEPTH = 6
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+
+
+class QueryBudgetExceeded(Exception):
+    """A request ran more queries than its budget or repeated a query shape (N+1)."""
+
+
+def query_shape(sql):
+    """`sql` with `IN (%s, %s, ...)` lists collapsed, so batches of any size share a shape."""
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+def _project_stack():
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if frame.filename.startswith(PROJECT_DIR) and 'site-packages' not in frame.filename
+        and frame.filename != __file__
+    ]
+    return traceback.format_list(frames[-STACK_DEPTH:])
+
+
+class QueryRecorder:
+    """Execute wrapper that records every query run while `record()` is active."""
+
+    def __init__(self):
+        self.queries = []
+        self.stacks = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            shape = query_shape(sql)
+            self.queries.append((shape, time.perf_counter() - started))
+            if shape not in self.stacks:
+                self.stacks[shape] = _project_stack()
+
+    @contextmanager
+    def record(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration_ms(self):
+        return sum(duration for _, duration in self.queries) * 1000
+
+    def duplicates(self, threshold):
+        """[(shape, times)] of the shapes run at least `threshold` times, most repeated first."""
+        counts = Counter(shape for shape, _ in self.queries)
+        return [(shape, n) for shape, n in counts.most_common() if n >= threshold]
+
+    def report(self, label, budget, threshold):
+        """Text describing what is wrong with this request, or '' if nothing is."""
+        duplicates = self.duplicates(threshold)
+        over_budget = budget is not None and self.count > budget
+        if not over_budget and not duplicates:
+            return ''
+        lines = [f'{label}: {self.count} queries in {self.duration_ms:.1f} ms (budget {budget})']
+        for shape, n in duplicates:
+            lines.append(f'  {n}x {shape}')
+            lines.extend('    ' + line for frame in self.stacks[shape] for line in frame.rstrip().splitlines())
+        return '\n'.join(lines)
@@ -0,0 +1,67 @@
+"""Motor de sesiones configurable con `SESSION_BACKEND` y limpieza por lotes.
+
+    db              una consulta a `django_session` en cada petición con sesión
+    cached_db       lee de la caché y solo va a la base de datos si falla
+                    (por defecto cuando la caché es compartida: redis, file)
+    cache           solo caché: se pierden las sesiones si se vacía
+    signed_cookies  la sesión viaja firmada (no cifrada) en la cookie; cerrar
+                    sesión no invalida copias anteriores de la cookie
+
+Con la caché en memoria por proceso `cached_db` no es seguro (cada worker
+tendría su copia de la sesión), así que el valor por defecto es `db`.
+"""
+from importlib import import_module
+
+from django.core.exceptions import ImproperlyConfigured
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+# Cache backends private to each process
+PER_PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+CLEAR_BATCH_SIZE = 1000
+
+
+def session_engine(backend, cache_config):
+    """SESSION_ENGINE for a SESSION_BACKEND value ('' picks the default for `cache_config`)."""
+    if not backend:
+        backend = 'db' if cache_config['BACKEND'] in PER_PROCESS_CACHES else 'cached_db'
+    if backend not in SESSION_ENGINES:
+        raise ImproperlyConfigured(
+            f'SESSION_BACKEND: "{backend}" no es válido (opciones: {", ".join(SESSION_ENGINES)})'
+        )
+    if backend in ('cached_db', 'cache') and cache_config['BACKEND'] in PER_PROCESS_CACHES:
+        raise ImproperlyConfigured(f'SESSION_BACKEND={backend} requiere una caché compartida (CACHE_URL)')
+    return SESSION_ENGINES[backend]
+
+
+def session_model():
+    """Model storing the sessions of the configured engine, or None if they don't live in the database."""
+    from django.conf import settings
+    from django.contrib.sessions.backends.db import SessionStore as DatabaseSessionStore
+    store = import_module(settings.SESSION_ENGINE).SessionStore
+    return store.get_model_class() if issubclass(store, DatabaseSessionStore) else None
+
+
+def clear_expired(batch_size=CLEAR_BATCH_SIZE, now=None):
+    """Delete expired sessions `batch_size` rows at a time, each batch in its
+    own statement, so a large backlog never holds a long lock on the table.
+    Returns how many were deleted (0 when sessions aren't stored in the database).
+    """
+    from django.utils import timezone
+    model = session_model()
+    if model is None:
+        return 0
+    expired = model.objects.filter(expire_date__lt=now or timezone.now())
+    deleted = 0
+    while True:
+        keys = list(expired.order_by().values_list('session_key', flat=True)[:batch_size])
+        if not keys:
+            return deleted
+        deleted += model.objects.filter(session_key__in=keys).delete()[0]
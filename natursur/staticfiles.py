@@ -0,0 +1,13 @@
+"""Cabeceras de los estáticos servidos por WhiteNoise."""
+
+# Hashed files never change under the same name: one year is the longest
+# lifetime browsers and CDNs are expected to honor (RFC 9111)
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def add_cache_headers(headers, path, url):
+    """WHITENOISE_ADD_HEADERS_FUNCTION: one-year immutable caching for files
+    with a content hash in their name (WhiteNoise defaults to ten years).
+    """
+    if 'immutable' in headers.get('Cache-Control', ''):
+        headers['Cache-Control'] = f'max-age={IMMUTABLE_MAX_AGE}, public, immutable'
@@ -0,0 +1,48 @@
+"""Vincula reservas con cuentas de usuario por email normalizado.
+
+Las reservas hechas como invitado sólo se vinculan a una cuenta nueva cuando
+su titular demuestra que recibe correo en ese email (`email_verification_token`
+y `verify_email`): si no, bastaría registrarse con el email de otra persona
+para ver sus citas.
+"""
+from django.core import signing
+from django.db.models.functions import Lower, Trim
+
+from .models import normalize_email
+
+EMAIL_VERIFICATION_SALT = 'reservas.accounts.verify_email'
+EMAIL_VERIFICATION_MAX_AGE = 3 * 24 * 3600
+
+
+def email_verification_token(user):
+    """Signed token for the verification link sent to `user`'s current email."""
+    return signing.dumps({'user': user.pk, 'email': normalize_email(user.email)}, salt=EMAIL_VERIFICATION_SALT)
+
+
+def verify_email(token):
+    """The user whose email `token` verifies, or None if it is invalid, expired
+    or the account's email has changed since it was sent.
+    """
+    from django.contrib.auth import get_user_model
+    try:
+        data = signing.loads(token, salt=EMAIL_VERIFICATION_SALT, max_age=EMAIL_VERIFICATION_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    user = get_user_model()._default_manager.filter(pk=data['user']).first()
+    if user is None or not data['email'] or normalize_email(user.email) != data['email']:
+        return None
+    return user
+
+
+def link_user(user):
+    """Link the unlinked reservations made with `user`'s email (one UPDATE).
+    Only for a verified email (see `verify_email`).
+    """
+    from .models import Reservation
+    key = normalize_email(user.email)
+    if not key:
+        return 0
+    User = type(user)
+    if User._default_manager.annotate(email_key=Lower(Trim('email'))).filter(email_key=key).exclude(pk=user.pk).exists():
+        return 0
+    return Reservation.objects.filter(user__isnull=True, email=key).update(user=user)
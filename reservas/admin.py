@@ -1,14 +1,80 @@
 from django.contrib import admin
-from .models import Reservation
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from .models import Reservation, ReservationArchive
 from .models import Offering
 
+# Below this many rows an exact COUNT(*) is cheap enough
+ESTIMATE_COUNT_THRESHOLD = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that avoids COUNT(*) over the whole table on PostgreSQL.
+    The unfiltered changelist uses the planner estimate (pg_class.reltuples);
+    filtered lists still count exactly. SQLite (the default database) has no
+    such estimate, so there every list falls back to a full COUNT(*).
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = self._estimated_rows()
+            if estimate is not None and estimate > ESTIMATE_COUNT_THRESHOLD:
+                return estimate
+        return super().count
+
+    def _estimated_rows(self):
+        conn = connections[self.object_list.db]
+        if conn.vendor != 'postgresql':
+            return None
+        with conn.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [self.object_list.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row and row[0] > 0 else None
+
 
 @admin.register(Reservation)
 class ReservationAdmin(admin.ModelAdmin):
-    list_display = ("name", "email", "phone", "service", "date", "time", "created_at")
-    list_filter = ("service", "date")
+    list_display = ("name", "email", "phone", "offering", "status", "date", "time", "created_at")
+    list_filter = ("status", "offering")
+    list_select_related = ("offering",)
+    # Plus the "-pk" Django appends: a backward walk of reserva_date_time_idx
+    # (or reserva_status_date_idx when filtered), with no sort step
+    ordering = ("-date", "-time")
+    date_hierarchy = "date"
     search_fields = ("name", "email", "phone")
+    autocomplete_fields = ("offering", "user")
+    paginator = EstimatedCountPaginator
+    list_per_page = 50
+    # Skip the second, unfiltered COUNT(*) shown next to filtered results
+    show_full_result_count = False
+
+
 @admin.register(Offering)
 class OfferingAdmin(admin.ModelAdmin):
     list_display = ('name', 'duration_minutes', 'price_eur', 'slug')
     prepopulated_fields = {'slug': ('name',)}
+    search_fields = ('name', 'slug')
+
+
+@admin.register(ReservationArchive)
+class ReservationArchiveAdmin(admin.ModelAdmin):
+    list_display = ("name", "email", "offering", "status", "date", "time", "archived_at")
+    list_filter = ("status",)
+    list_select_related = ("offering",)
+    date_hierarchy = "date"
+    search_fields = ("name", "email", "phone")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -5,3 +5,7 @@ class ReservasConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reservas'
     verbose_name = 'Reservas'
+
+    def ready(self):
+        # Register signal handlers (DailyStats and search index upkeep)
+        from . import signals  # noqa: F401
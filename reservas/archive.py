@@ -0,0 +1,51 @@
+"""Archivado de reservas antiguas en `ReservationArchive`.
+
+Se mueven en lotes acotados, cada uno en su propia transacción (copiar y
+borrar), para no bloquear la base de datos durante toda la operación.
+"""
+import calendar
+from datetime import date
+
+from django.db import transaction
+
+from . import changes, search, stats
+from .models import Reservation, ReservationArchive
+
+ARCHIVE_BATCH_SIZE = 500
+
+
+def months_ago(today, months):
+    """Same day `months` months before `today` (clamped to the month's last day)."""
+    year, month = divmod(today.year * 12 + today.month - 1 - months, 12)
+    month += 1
+    return date(year, month, min(today.day, calendar.monthrange(year, month)[1]))
+
+
+def archive_before(cutoff, batch_size=ARCHIVE_BATCH_SIZE, limit=None):
+    """Move reservations dated before `cutoff` into the archive. Returns how many moved."""
+    moved = 0
+    while limit is None or moved < limit:
+        size = batch_size if limit is None else min(batch_size, limit - moved)
+        count = _archive_batch(cutoff, size)
+        moved += count
+        if count < size:
+            break
+    return moved
+
+
+def _archive_batch(cutoff, size):
+    with transaction.atomic():
+        rows = list(
+            Reservation.objects.filter(date__lt=cutoff)
+            .order_by('id')
+            .select_for_update()
+            .values(*ReservationArchive.COPIED_FIELDS)[:size]
+        )
+        if not rows:
+            return 0
+        ReservationArchive.objects.bulk_create([ReservationArchive(**row) for row in rows])
+        # Stats are recomputed over both tables, so the touched days keep their figures.
+        # The post_delete handlers only collect; each batch flushes once on exit
+        with stats.stats_batch(), changes.changes_batch(), search.unindex_batch():
+            Reservation.objects.filter(id__in=[row['id'] for row in rows]).delete()
+    return len(rows)
@@ -0,0 +1,311 @@
+"""Bundles minificados de CSS/JS y CSS crítico de la portada.
+
+Los estilos y scripts que antes iban en línea en las plantillas viven ahora en
+`static/reservas/css/` y `static/reservas/js/`. `python manage.py build_assets`
+concatena y minifica cada bundle de `BUNDLES` en `static/reservas/dist/` y
+extrae de `style.css` las reglas del contenido visible al cargar la portada
+(`CRITICAL_SELECTORS`). `collectstatic` añade después el hash al nombre. La
+etiqueta `{% bundle %}` (templatetags/assets.py) sirve el bundle con
+`DEBUG=False` y los ficheros fuente en desarrollo o si no se ha construido.
+"""
+import re
+from pathlib import Path
+
+STATIC_DIR = Path(__file__).resolve().parent / 'static'
+OUTPUT_PREFIX = 'reservas/dist'
+
+# Bundle name -> static sources, concatenated in this order
+BUNDLES = {
+    'site.css': ('reservas/css/style.css', 'reservas/css/pages.css'),
+    'admin.css': ('reservas/css/admin.css',),
+    'site.js': ('reservas/js/menu.js', 'reservas/js/site.js'),
+    'home.js': ('reservas/js/home.js',),
+    'admin.js': ('reservas/js/admin.js',),
+}
+CRITICAL_SOURCE = 'reservas/css/style.css'
+CRITICAL_NAME = 'critical.css'
+# Rules whose selector starts with one of these are inlined on the home page:
+# theme variables, base layout, header, menu and hero with its buttons
+CRITICAL_SELECTORS = frozenset((
+    ':root', '*', 'html', 'body', '.container', '.ns-header', '.nav', '.left', '.right', '.logo',
+    '.hamburger', '.menu-panel', '.hero', '.hero-cover', '.hero-inner', '.hero-bg-layer', '.pill',
+    '.btn', '.btn-primary', '.btn-ghost', '.btn-light', '.btn-pill', '.cta-row', '.alert',
+))
+
+
+def bundle_path(name):
+    """Static path of the built bundle: 'site.css' -> 'reservas/dist/site.min.css'."""
+    stem, ext = name.rsplit('.', 1)
+    return f'{OUTPUT_PREFIX}/{stem}.min.{ext}'
+
+
+def is_built(name, static_dir=STATIC_DIR):
+    return (Path(static_dir) / bundle_path(name)).exists()
+
+
+# Strings and url(...) are copied as is; comments outside them are dropped
+_CSS_LITERAL_OR_COMMENT = re.compile(r'("(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\'|url\([^)]*\))|/\*.*?\*/', re.S | re.I)
+
+
+def _protect_css_literals(css):
+    """`css` without comments and with its literals replaced by placeholders,
+    and the list of literals to put back with `_restore_css_literals`.
+    """
+    literals = []
+
+    def replace(match):
+        if match.group(1) is None:
+            return ''
+        literals.append(match.group(1))
+        return f'\x00{len(literals) - 1}\x00'
+
+    return _CSS_LITERAL_OR_COMMENT.sub(replace, css), literals
+
+
+def _restore_css_literals(css, literals):
+    return re.sub(r'\x00(\d+)\x00', lambda m: literals[int(m.group(1))], css)
+
+
+def minify_css(css):
+    css, literals = _protect_css_literals(css)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    # Innermost blocks only hold declarations: "color: red" -> "color:red"
+    css = re.sub(r'\{([^{}]*)\}', lambda m: '{' + re.sub(r'\s*:\s*', ':', m.group(1)) + '}', css)
+    return _restore_css_literals(css.replace(';}', '}').strip(), literals)
+
+
+# A "/" after one of these (or at the start) begins a regular expression, not a division
+_JS_REGEX_AFTER = frozenset('(,=:[!&|?{};+-*%<>~^')
+_JS_REGEX_KEYWORDS = frozenset((
+    'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw',
+    'instanceof', 'yield', 'await',
+))
+
+
+def _skip_string(js, i, quote):
+    while i < len(js):
+        if js[i] == '\\':
+            i += 2
+        elif js[i] == quote:
+            return i + 1
+        elif js[i] == '\n':
+            return i
+        else:
+            i += 1
+    return len(js)
+
+
+def _skip_template(js, i):
+    while i < len(js):
+        if js[i] == '\\':
+            i += 2
+        elif js[i] == '`':
+            return i + 1
+        elif js.startswith('${', i):
+            i = _skip_braces(js, i + 2)
+        else:
+            i += 1
+    return len(js)
+
+
+def _skip_braces(js, i):
+    """End of a `${...}` substitution, which may hold strings and templates."""
+    depth = 1
+    while i < len(js):
+        c = js[i]
+        if c in '\'"':
+            i = _skip_string(js, i + 1, c)
+            continue
+        if c == '`':
+            i = _skip_template(js, i + 1)
+            continue
+        depth += {'{': 1, '}': -1}.get(c, 0)
+        i += 1
+        if not depth:
+            return i
+    return len(js)
+
+
+def _skip_regex(js, i):
+    in_class = False
+    while i < len(js):
+        c = js[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c == '\n':
+            return i
+        if c == '[':
+            in_class = True
+        elif c == ']':
+            in_class = False
+        elif c == '/' and not in_class:
+            i += 1
+            while i < len(js) and js[i].isalpha():
+                i += 1
+            return i
+        i += 1
+    return len(js)
+
+
+def _regex_allowed(before):
+    before = before.rstrip()
+    if not before or before[-1] in _JS_REGEX_AFTER:
+        return True
+    word = re.search(r'[\w$]+$', before)
+    return bool(word) and word.group() in _JS_REGEX_KEYWORDS
+
+
+def _js_tokens(js):
+    """Split `js` into ('code' | 'literal' | 'comment', text) pieces. Literals
+    are strings, template literals (with their `${...}`) and regular expressions.
+    """
+    tokens = []
+    # Significant code before the current piece, to tell a regex from a division
+    before = ''
+    start = i = 0
+    while i < len(js):
+        c = js[i]
+        if c in '\'"':
+            kind, end = 'literal', _skip_string(js, i + 1, c)
+        elif c == '`':
+            kind, end = 'literal', _skip_template(js, i + 1)
+        elif js.startswith('//', i):
+            end = js.find('\n', i)
+            kind, end = 'comment', len(js) if end == -1 else end
+        elif js.startswith('/*', i):
+            end = js.find('*/', i + 2)
+            kind, end = 'comment', len(js) if end == -1 else end + 2
+        elif c == '/' and _regex_allowed(before + js[start:i]):
+            kind, end = 'literal', _skip_regex(js, i + 1)
+        else:
+            i += 1
+            continue
+        if start < i:
+            tokens.append(('code', js[start:i]))
+            before = (before + js[start:i])[-64:]
+        tokens.append((kind, js[i:end]))
+        if kind == 'literal':
+            before += '"'
+        start = i = end
+    if start < len(js):
+        tokens.append(('code', js[start:]))
+    return tokens
+
+
+def minify_js(js):
+    """Drop indentation, blank lines and comments.
+
+    Conservative on purpose (no renaming, line breaks kept for ASI). The
+    source is lexed first, so strings, template literals and regular
+    expressions are copied untouched even if they hold `//`, `/*` or span
+    several lines.
+    """
+    lines = []
+    line = []
+
+    def end_line():
+        text = ''.join(line).rstrip()
+        if text:
+            lines.append(text)
+        line.clear()
+
+    for kind, text in _js_tokens(js):
+        if kind == 'literal':
+            line.append(text)
+        elif kind == 'comment':
+            if '\n' in text:
+                end_line()
+            elif line:
+                line.append(' ')
+        else:
+            for n, part in enumerate(text.split('\n')):
+                if n:
+                    end_line()
+                if not line:
+                    part = part.lstrip()
+                if part:
+                    line.append(part)
+    end_line()
+    return '\n'.join(lines) + '\n'
+
+
+def _rules(css):
+    """Top-level (prelude, body) pairs; at-rule bodies are returned as is."""
+    rules = []
+    pos = 0
+    while True:
+        start = css.find('{', pos)
+        if start == -1:
+            return rules
+        depth, end = 1, start + 1
+        while depth and end < len(css):
+            depth += {'{': 1, '}': -1}.get(css[end], 0)
+            end += 1
+        rules.append((css[pos:start].strip(), css[start + 1:end - 1]))
+        pos = end
+
+
+def _is_critical(prelude, selectors):
+    for selector in prelude.split(','):
+        match = re.match(r'\s*(:root|\*|[.#]?[\w-]+)', selector)
+        if match and match.group(1) in selectors:
+            return True
+    return False
+
+
+def critical_css(css, selectors=CRITICAL_SELECTORS):
+    """The rules of `css` matching `selectors` (also inside @media), minified.
+    Other at-rules (@font-face, @keyframes) are always kept.
+    """
+    css, literals = _protect_css_literals(css)
+    kept = []
+    for prelude, body in _rules(css):
+        if prelude.startswith(('@media', '@supports')):
+            inner = critical_css(body, selectors)
+            if inner:
+                kept.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@') or _is_critical(prelude, selectors):
+            kept.append(f'{prelude}{{{body}}}')
+    return minify_css(_restore_css_literals(''.join(kept), literals))
+
+
+def build(bundles=BUNDLES, static_dir=STATIC_DIR):
+    """Write every bundle and the critical CSS under OUTPUT_PREFIX.
+
+    Returns {static path: {'source_bytes', 'bytes'}}.
+    """
+    static_dir = Path(static_dir)
+    (static_dir / OUTPUT_PREFIX).mkdir(parents=True, exist_ok=True)
+    outputs = {}
+    for name, sources in bundles.items():
+        texts = [(static_dir / source).read_text(encoding='utf-8') for source in sources]
+        if name.endswith('.css'):
+            content = minify_css('\n'.join(texts))
+        else:
+            # ";" between files: a source ending in an expression must not swallow the next "(function(){"
+            content = minify_js('\n;\n'.join(texts))
+        outputs[bundle_path(name)] = (content, sum(len(t.encode()) for t in texts))
+    source = (static_dir / CRITICAL_SOURCE).read_text(encoding='utf-8')
+    outputs[f'{OUTPUT_PREFIX}/{CRITICAL_NAME}'] = (critical_css(source), len(source.encode()))
+    report = {}
+    for path, (content, source_bytes) in outputs.items():
+        (static_dir / path).write_text(content, encoding='utf-8')
+        report[path] = {'source_bytes': source_bytes, 'bytes': len(content.encode())}
+    return report
+
+
+_critical = {'key': None, 'css': ''}
+
+
+def load_critical_css(static_dir=STATIC_DIR):
+    """The critical CSS written by `build` ('' if it was never run), re-read when the file changes."""
+    path = Path(static_dir) / OUTPUT_PREFIX / CRITICAL_NAME
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return ''
+    if _critical['key'] != (path, mtime):
+        _critical.update(key=(path, mtime), css=path.read_text(encoding='utf-8'))
+    return _critical['css']
@@ -0,0 +1,162 @@
+"""Catálogo de ofertas en memoria del proceso.
+
+La tabla `Offering` tiene media docena de filas y casi no cambia, pero la
+consultaban la portada, el formulario de reserva, la disponibilidad y el correo
+de confirmación en cada petición. Cada worker guarda aquí una copia y la
+recarga cuando cambia la versión publicada en la fila `CatalogVersion`:
+guardar o borrar una oferta publica una versión nueva en la misma transacción,
+así que todos los workers recargan en su siguiente acceso aunque la caché de
+Django sea local a cada proceso.
+
+Leer la versión es una consulta por clave primaria; durante una petición se
+lee una sola vez (`begin_request`/`end_request`, conectadas a las señales de
+petición de Django) y fuera de ellas en cada acceso. Dentro de una
+transacción se lee la tabla, una vez por transacción (`_transaction_snapshot`).
+
+Las instancias devueltas se comparten entre peticiones: son de solo lectura.
+"""
+import threading
+import uuid
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .models import CatalogVersion, Offering
+
+# Primary key of the only CatalogVersion row
+VERSION_ROW = 1
+# Duración asumida para reservas sin oferta asociada
+DEFAULT_DURATION_MINUTES = 60
+
+_lock = threading.Lock()
+_state = {'version': None, 'offerings': (), 'by_id': {}}
+# Per-thread: whether a request is being served and the version it has read
+_request = threading.local()
+# Per-thread: the snapshot read inside the current transaction
+_transaction = threading.local()
+
+
+def _read_version():
+    # Always the primary: a lagging replica could hand out an old version
+    versions = CatalogVersion.objects.using(DEFAULT_DB_ALIAS)
+    version = versions.filter(pk=VERSION_ROW).values_list('token', flat=True).first()
+    if version is None:
+        # Table emptied (flush): publish one; get_or_create keeps a concurrent one
+        version = versions.get_or_create(pk=VERSION_ROW, defaults={'token': uuid.uuid4().hex})[0].token
+    return version
+
+
+def _current_version():
+    if not getattr(_request, 'active', False):
+        return _read_version()
+    if _request.version is None:
+        _request.version = _read_version()
+    return _request.version
+
+
+def begin_request(**kwargs):
+    """Start of a request: its first catalog access reads the version, the rest reuse it."""
+    _request.active = True
+    _request.version = None
+
+
+def end_request(**kwargs):
+    _request.active = False
+    _request.version = None
+
+
+def _load():
+    offerings = tuple(Offering.objects.using(DEFAULT_DB_ALIAS).order_by('duration_minutes', 'pk'))
+    return {o.pk: o for o in offerings}, offerings
+
+
+def _transaction_snapshot(connection):
+    """Inside a transaction uncommitted offering changes must be visible: read
+    the table once per transaction. The snapshot is valid while the on_commit
+    callback registered with it is pending: Django runs it on commit and drops
+    it on rollback, also when only the savepoint it was read in rolls back.
+    """
+    memo = getattr(_transaction, 'memo', None)
+    if memo is not None and memo['connection'] is connection and any(
+        func is memo['release'] for _, func, _ in connection.run_on_commit
+    ):
+        return memo['state']
+    by_id, offerings = _load()
+    memo = {'connection': connection, 'state': {'version': None, 'offerings': offerings, 'by_id': by_id}}
+
+    def release():
+        if getattr(_transaction, 'memo', None) is memo:
+            _transaction.memo = None
+
+    memo['release'] = release
+    connection.on_commit(release)
+    _transaction.memo = memo
+    return memo['state']
+
+
+def _snapshot():
+    connection = connections[DEFAULT_DB_ALIAS]
+    if connection.in_atomic_block:
+        return _transaction_snapshot(connection)
+    version = _current_version()
+    state = _state
+    if state['version'] != version:
+        with _lock:
+            state = _state
+            if state['version'] != version:
+                by_id, offerings = _load()
+                state = {'version': version, 'offerings': offerings, 'by_id': by_id}
+                _state.update(state)
+    return state
+
+
+def offerings():
+    """All offerings ordered by duration (as shown on the home page)."""
+    return _snapshot()['offerings']
+
+
+def version():
+    """Version of the catalog in use, for cache keys derived from it.
+    None inside a transaction, where the catalog is read uncached.
+    """
+    return _snapshot()['version']
+
+
+def get(pk):
+    """The offering with primary key `pk`, or None."""
+    if pk is None:
+        return None
+    return _snapshot()['by_id'].get(pk)
+
+
+def duration_minutes(offering_id):
+    """Duration of the offering `offering_id`, or the default for unknown/empty ones."""
+    offering = get(offering_id)
+    if offering is None or not offering.duration_minutes:
+        return DEFAULT_DURATION_MINUTES
+    return int(offering.duration_minutes)
+
+
+def clear():
+    """Forget this process' copy; the next access reloads it."""
+    with _lock:
+        _state.update({'version': None, 'offerings': (), 'by_id': {}})
+    _request.version = None
+    _transaction.memo = None
+
+
+def bump_version():
+    """Publish a new catalog version so every worker reloads on its next access.
+
+    Inside a transaction the new version commits (or rolls back) together with
+    the offering change, so no worker can load the old rows under it.
+    """
+    clear()
+    token = uuid.uuid4().hex
+    versions = CatalogVersion.objects.using(DEFAULT_DB_ALIAS)
+    if not versions.filter(pk=VERSION_ROW).update(token=token):
+        versions.update_or_create(pk=VERSION_ROW, defaults={'token': token})
+
+
+def invalidate():
+    """An offering changed: publish a new version (see `bump_version`)."""
+    bump_version()
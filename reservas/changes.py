@@ -0,0 +1,83 @@
+"""Registro de cambios de reservas (`ReservationChange`) para el panel en directo.
+
+Las entradas se insertan con `transaction.on_commit`: un cambio que se
+deshace nunca llega al panel. El panel usa el id como cursor (`id > cursor`),
+así que un id nunca puede hacerse visible después de otro mayor. Una secuencia
+de PostgreSQL reparte los ids antes del commit (dos inserciones concurrentes
+pueden confirmarse en otro orden), por eso cada inserción bloquea la tabla
+para otros escritores hasta su commit; en SQLite las escrituras ya van de una
+en una.
+"""
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import router, transaction
+from django.utils import timezone
+
+from .models import ReservationChange
+
+_batch = threading.local()
+
+
+def _insert(entries):
+    using = router.db_for_write(ReservationChange)
+    with transaction.atomic(using=using):
+        connection = transaction.get_connection(using)
+        if connection.vendor == 'postgresql':
+            # EXCLUSIVE blocks other writers until commit but not the panel's reads
+            with connection.cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {ReservationChange._meta.db_table} IN EXCLUSIVE MODE')
+        ReservationChange.objects.using(using).bulk_create(
+            [ReservationChange(reservation_id=rid, action=action) for rid, action in entries],
+            batch_size=500,
+        )
+
+
+@contextmanager
+def changes_batch():
+    """Collect the changes recorded inside the block and insert them with one bulk_create."""
+    if getattr(_batch, 'entries', None) is not None:
+        yield
+        return
+    _batch.entries = []
+    try:
+        yield
+        entries = _batch.entries
+    finally:
+        _batch.entries = None
+    if entries:
+        transaction.on_commit(lambda: _insert(entries))
+
+
+def record(reservation_id, action):
+    """Log one change (inserted once the current transaction commits)."""
+    record_many([reservation_id], action)
+
+
+def record_many(reservation_ids, action):
+    """Log the same change for several reservations with a single insert."""
+    entries = [(rid, action) for rid in reservation_ids]
+    if not entries:
+        return
+    pending = getattr(_batch, 'entries', None)
+    if pending is not None:
+        pending.extend(entries)
+    else:
+        transaction.on_commit(lambda: _insert(entries))
+
+
+def latest_id():
+    """Current end of the change log (0 when empty), read from the primary
+    even inside a `readonly_view`: a lagging replica would hand out a cursor
+    from the past.
+    """
+    using = router.db_for_write(ReservationChange)
+    last = ReservationChange.objects.using(using).order_by('-id').values_list('id', flat=True).first()
+    return last or 0
+
+
+def prune(days=7):
+    """Delete change-log entries older than `days`. Returns how many were removed."""
+    cutoff = timezone.now() - timedelta(days=days)
+    return ReservationChange.objects.filter(created_at__lt=cutoff).delete()[0]
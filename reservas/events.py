@@ -0,0 +1,155 @@
+"""Server-sent events del panel de reservas.
+
+Todas las conexiones abiertas en un mismo proceso comparten un único sondeo
+del registro de cambios (`ChangeBroadcaster`): con 50 empleados conectados
+se hace una consulta por intervalo, no 50.
+"""
+import asyncio
+import json
+from collections import deque
+
+from asgiref.sync import sync_to_async
+from django.template.loader import render_to_string
+
+from . import changes
+from .models import Reservation, ReservationChange
+
+# How often the shared poller checks the change log
+POLL_SECONDS = 1.0
+# Streams close after this long; EventSource reconnects with Last-Event-ID
+STREAM_MAX_SECONDS = 300
+# Comment lines keep proxies from closing idle connections
+KEEPALIVE_SECONDS = 15
+# Reconnection delay suggested to the browser
+RETRY_MS = 3000
+# Changes kept in memory for clients that are slightly behind
+RECENT_EVENTS = 500
+MAX_EVENTS_PER_POLL = 200
+
+
+def load_events(after_id, limit=MAX_EVENTS_PER_POLL):
+    """Read change-log entries after `after_id` with the current row HTML.
+    Two queries regardless of how many changes or clients there are.
+    """
+    entries = list(ReservationChange.objects.filter(id__gt=after_id).order_by('id')[:limit])
+    ids = {c.reservation_id for c in entries if c.action != ReservationChange.ACTION_DELETED}
+    rows = {r.id: r for r in Reservation.objects.select_related('offering').filter(id__in=ids)}
+    html = {}
+    events = []
+    for c in entries:
+        row = rows.get(c.reservation_id)
+        action = c.action if row is not None else ReservationChange.ACTION_DELETED
+        if row is not None and row.id not in html:
+            html[row.id] = render_to_string('reservas/admin_reservation_row.html', {'r': row})
+        events.append({
+            'id': c.id,
+            'action': action,
+            'reservation_id': c.reservation_id,
+            'html': html.get(c.reservation_id),
+        })
+    return events
+
+
+class ChangeBroadcaster:
+    """Single change-log poller per event loop, fanned out to every open stream."""
+
+    def __init__(self):
+        self.latest_id = None
+        # Events with id > window_start are all present in `recent`
+        self.window_start = None
+        self.recent = deque(maxlen=RECENT_EVENTS)
+        self.condition = asyncio.Condition()
+        self.subscribers = 0
+        self.task = None
+        self.polls = 0
+
+    async def start(self):
+        if self.latest_id is None:
+            self.latest_id = await sync_to_async(changes.latest_id)()
+            self.window_start = self.latest_id
+        if self.task is None or self.task.done():
+            self.task = asyncio.ensure_future(self._poll())
+        return self.latest_id
+
+    async def _poll(self):
+        idle_rounds = 0
+        while idle_rounds < 3:
+            events = await sync_to_async(load_events)(self.latest_id)
+            self.polls += 1
+            if events:
+                self.recent.extend(events)
+                if len(self.recent) == RECENT_EVENTS:
+                    self.window_start = self.recent[0]['id'] - 1
+                async with self.condition:
+                    self.latest_id = events[-1]['id']
+                    self.condition.notify_all()
+                if len(events) == MAX_EVENTS_PER_POLL:
+                    continue
+            idle_rounds = idle_rounds + 1 if self.subscribers == 0 else 0
+            await asyncio.sleep(POLL_SECONDS)
+
+    async def events_after(self, cursor, timeout):
+        """Events newer than `cursor`, waiting up to `timeout` seconds for one to arrive."""
+        await self.start()
+        if cursor < self.window_start:
+            # Client is further behind than the in-memory window: read the log directly
+            return await sync_to_async(load_events)(cursor)
+        self.subscribers += 1
+        try:
+            async with self.condition:
+                try:
+                    await asyncio.wait_for(self.condition.wait_for(lambda: self.latest_id > cursor), timeout)
+                except asyncio.TimeoutError:
+                    return []
+        finally:
+            self.subscribers -= 1
+        return [e for e in self.recent if e['id'] > cursor]
+
+
+_broadcasters = {}
+
+
+def get_broadcaster():
+    loop = asyncio.get_running_loop()
+    broadcaster = _broadcasters.get(loop)
+    if broadcaster is None:
+        # Drop broadcasters of loops that are gone (tests create one loop per call)
+        for old_loop in [lp for lp in _broadcasters if lp.is_closed()]:
+            del _broadcasters[old_loop]
+        broadcaster = _broadcasters[loop] = ChangeBroadcaster()
+    return broadcaster
+
+
+def format_event(event):
+    data = json.dumps({k: event[k] for k in ('action', 'reservation_id', 'html')})
+    return f"id: {event['id']}\nevent: reservation\ndata: {data}\n\n"
+
+
+async def stream_changes(cursor, max_seconds=STREAM_MAX_SECONDS):
+    """Async generator of SSE messages for changes after `cursor`, open for `max_seconds`."""
+    broadcaster = get_broadcaster()
+    latest = await broadcaster.start()
+    if cursor is None:
+        cursor = latest
+    yield f"retry: {RETRY_MS}\n\n"
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_seconds
+    while True:
+        remaining = deadline - loop.time()
+        events = await broadcaster.events_after(cursor, max(0, min(KEEPALIVE_SECONDS, remaining)))
+        for event in events:
+            cursor = event['id']
+            yield format_event(event)
+        if loop.time() >= deadline:
+            return
+        if not events:
+            yield ": keepalive\n\n"
+
+
+def pending_changes(cursor):
+    """SSE body with the changes after `cursor`, for one-shot (WSGI) responses."""
+    if cursor is None:
+        cursor = changes.latest_id()
+    messages = [f"retry: {RETRY_MS}\n\n"]
+    messages.extend(format_event(event) for event in load_events(cursor))
+    return ''.join(messages)
@@ -1,10 +1,14 @@
 from django import forms
-from .models import Reservation
+from django.contrib.auth.forms import UserCreationForm
+from .models import Reservation, normalize_email
 from django.utils import timezone
 from .models import Reservation as ReservationModel
 from datetime import datetime, timedelta
 import re
 from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
+
+from . import catalog
 
 
 class DateInput(forms.DateInput):
@@ -27,12 +31,66 @@ def validate_phone(value):
         raise ValidationError('El teléfono debe tener entre 7 y 15 dígitos.')
 
 
+class SignUpForm(UserCreationForm):
+    """Alta de cliente. El email se verifica (enlace por correo) antes de
+    vincularle las reservas hechas sin cuenta.
+    """
+    email = forms.EmailField(label='Email')
+
+    class Meta(UserCreationForm.Meta):
+        fields = ('username', 'email')
+
+    def clean_email(self):
+        return normalize_email(self.cleaned_data['email'])
+
+
+class CatalogChoiceIterator(ModelChoiceIterator):
+    """Offering choices read from the in-process catalog instead of the queryset."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for offering in catalog.offerings():
+            yield self.choice(offering)
+
+    def __len__(self):
+        return len(catalog.offerings()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(catalog.offerings())
+
+
+class OfferingChoiceField(forms.ModelChoiceField):
+    """Select de ofertas que no consulta la base de datos (ver `reservas.catalog`)."""
+    iterator = CatalogChoiceIterator
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, self.queryset.model):
+            value = value.pk
+        try:
+            offering = catalog.get(int(value))
+        except (TypeError, ValueError):
+            offering = None
+        if offering is None:
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return offering
+
+
 class ReservationForm(forms.ModelForm):
     class Meta:
         model = Reservation
         fields = [
-            'name', 'email', 'phone', 'offering', 'service', 'date', 'time', 'notes'
+            'name', 'email', 'phone', 'offering', 'date', 'time', 'notes'
         ]
+        field_classes = {
+            'offering': OfferingChoiceField,
+        }
         widgets = {
             'date': DateInput(),
             'time': TimeInput(),
@@ -44,12 +102,17 @@ class ReservationForm(forms.ModelForm):
             'email': 'Correo electrónico',
             'phone': 'Teléfono',
             'offering': 'Oferta',
-            'service': 'Servicio',
             'date': 'Fecha',
             'time': 'Hora',
             'notes': 'Notas',
         }
 
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        # OfferingChoiceField already checked the offering exists; skip the model's FK query
+        exclude.add('offering')
+        return exclude
+
     def clean_phone(self):
         phone = self.cleaned_data.get('phone', '')
         if phone:
@@ -80,10 +143,10 @@ class ReservationForm(forms.ModelForm):
         end_dt = start_dt + timedelta(minutes=duration)
 
         # check overlaps: any existing reservation whose interval intersects
-        qs = ReservationModel.objects.filter(date=date).exclude(pk=self.instance.pk if self.instance else None)
+        qs = ReservationModel.objects.active().filter(date=date).exclude(pk=self.instance.pk if self.instance else None)
         for r in qs:
             r_start = timezone.make_aware(datetime.combine(r.date, r.time)) if timezone.is_naive(datetime.combine(r.date, r.time)) else datetime.combine(r.date, r.time)
-            r_end = r_start + timedelta(minutes=(r.offering.duration_minutes if r.offering else 60))
+            r_end = r_start + timedelta(minutes=catalog.duration_minutes(r.offering_id))
             # overlap if start < r_end and r_start < end
             if (start_dt < r_end) and (r_start < end_dt):
                 raise forms.ValidationError('El horario seleccionado se solapa con otra reserva. Elige otra hora.')
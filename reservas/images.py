@@ -0,0 +1,103 @@
+"""Variantes responsive (WebP y, si Pillow lo soporta, AVIF) de las imágenes grandes.
+
+`python manage.py generate_responsive_images` escribe las variantes en
+`static/reservas/img/responsive/` junto con `manifest.json`; la etiqueta
+`{% responsive_image %}` (templatetags/responsive_images.py) lee ese manifiesto
+para emitir `<picture>` con `srcset`. Las variantes no se versionan: se generan
+en el build, antes de `collectstatic`.
+"""
+import json
+from pathlib import Path
+
+from PIL import Image
+
+try:
+    # Optional AVIF encoder for Pillow < 11.2 (pip install pillow-avif-plugin)
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+STATIC_DIR = Path(__file__).resolve().parent / 'static'
+OUTPUT_PREFIX = 'reservas/img/responsive'
+MANIFEST_NAME = 'manifest.json'
+
+# Static paths of the images served responsive
+SOURCES = (
+    'reservas/img/1.png',
+    'reservas/img/2.png',
+    'reservas/img/3.png',
+    'reservas/img/4.png',
+    'reservas/img/back-unete-al-equipo.png',
+)
+# Widths generated (never upscaled; the original width is added when it is smaller than the largest)
+WIDTHS = (480, 768, 1200, 1920)
+# Best format first: <picture> offers them in this order
+FORMATS = {
+    'avif': {'quality': 50},
+    'webp': {'quality': 75, 'method': 6},
+}
+
+
+def available_formats():
+    Image.init()
+    return [fmt for fmt in FORMATS if fmt.upper() in Image.SAVE]
+
+
+def target_widths(width, widths=WIDTHS):
+    sizes = [w for w in widths if w < width]
+    if width <= max(widths):
+        sizes.append(width)
+    return sizes or [width]
+
+
+def manifest_path(static_dir=STATIC_DIR):
+    return Path(static_dir) / OUTPUT_PREFIX / MANIFEST_NAME
+
+
+def generate(sources=SOURCES, static_dir=STATIC_DIR, widths=WIDTHS, formats=None, force=False):
+    """Write the variants of every source and the manifest. Existing
+    variants newer than their source are kept unless `force`.
+
+    Returns the manifest: {source: {width, height, bytes, variants: {fmt: [{path, width, bytes}]}}}.
+    """
+    static_dir = Path(static_dir)
+    formats = formats or available_formats()
+    out_dir = static_dir / OUTPUT_PREFIX
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    for source in sources:
+        src_path = static_dir / source
+        with Image.open(src_path) as image:
+            image.load()
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+            entry = {'width': image.width, 'height': image.height, 'bytes': src_path.stat().st_size, 'variants': {}}
+            for fmt in formats:
+                variants = []
+                for width in target_widths(image.width, widths):
+                    path = f'{OUTPUT_PREFIX}/{Path(source).stem}-{width}.{fmt}'
+                    out_path = static_dir / path
+                    if force or not out_path.exists() or out_path.stat().st_mtime < src_path.stat().st_mtime:
+                        height = round(image.height * width / image.width)
+                        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+                        resized.save(out_path, fmt.upper(), **FORMATS[fmt])
+                    variants.append({'path': path, 'width': width, 'bytes': out_path.stat().st_size})
+                entry['variants'][fmt] = variants
+        manifest[source] = entry
+    manifest_path(static_dir).write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    return manifest
+
+
+_loaded = {'key': None, 'manifest': {}}
+
+
+def load_manifest(static_dir=STATIC_DIR):
+    """The manifest written by `generate` ({} if it was never run), re-read when the file changes."""
+    path = manifest_path(static_dir)
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return {}
+    if _loaded['key'] != (path, mtime):
+        _loaded.update(key=(path, mtime), manifest=json.loads(path.read_text()))
+    return _loaded['manifest']
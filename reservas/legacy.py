@@ -0,0 +1,82 @@
+"""Retirada del campo heredado `Reservation.service`.
+
+Las reservas antiguas sólo guardaban `service` (masaje, biomagnético…) y su
+duración salía de un mapeo fijo. Aquí se asigna a cada una la oferta
+equivalente, de modo que la duración sale siempre de `Offering`. Sólo se usan
+ofertas que ya existen: precio y nombre son decisiones del negocio, así que
+un servicio cuya oferta falta se queda sin asignar y aparece en el informe.
+La migración 0012 tiene su propia copia congelada de esta lógica.
+"""
+from django.db import transaction
+from django.db.models import Count
+
+# Legacy service -> slug of the offering with the same duration
+SERVICE_OFFERING_SLUGS = {
+    'masaje': 'sesion-60',
+    'biomagnetico': 'sesion-60',
+    'emocionales': 'sesion-40',
+    'nutricional': 'sesion-60',
+}
+MIGRATION_BATCH_SIZE = 500
+
+
+def _pending(reservations, service):
+    return reservations.filter(service=service, offering__isnull=True)
+
+
+def plan(reservation_querysets, offerings):
+    """Dry-run report: one row per legacy service still without offering.
+
+    Rows have service, count, slug, duration and whether the offering exists;
+    services with no mapping have slug None, and duration is None unless the
+    offering exists.
+    """
+    existing = {o.slug: o for o in offerings.filter(slug__in=set(SERVICE_OFFERING_SLUGS.values()))}
+    counts = {}
+    for reservations in reservation_querysets:
+        rows = (
+            reservations.filter(offering__isnull=True).exclude(service='')
+            .order_by().values_list('service').annotate(n=Count('pk'))
+        )
+        for service, n in rows:
+            counts[service] = counts.get(service, 0) + n
+    report = []
+    for service, n in sorted(counts.items()):
+        slug = SERVICE_OFFERING_SLUGS.get(service)
+        offering = existing.get(slug)
+        duration = offering.duration_minutes if offering else None
+        report.append({
+            'service': service,
+            'count': n,
+            'slug': slug,
+            'duration_minutes': duration,
+            'exists': offering is not None,
+        })
+    return report
+
+
+def assign_offerings(reservation_querysets, offerings, batch_size=MIGRATION_BATCH_SIZE, dates=None):
+    """Set `offering` on reservations that only have a legacy `service`.
+
+    Only existing offerings are used: services whose target offering is
+    missing are left as they are (see `plan`). Each batch of ids is updated
+    in its own transaction. Returns how many reservations were updated; their
+    days are added to the set `dates` if one is given.
+    """
+    targets = dict(offerings.filter(slug__in=set(SERVICE_OFFERING_SLUGS.values())).values_list('slug', 'pk'))
+    updated = 0
+    for reservations in reservation_querysets:
+        for service, slug in SERVICE_OFFERING_SLUGS.items():
+            if slug not in targets:
+                continue
+            pending = _pending(reservations, service)
+            while True:
+                with transaction.atomic(using=reservations.db):
+                    rows = list(pending.order_by('pk').values_list('pk', 'date')[:batch_size])
+                    if not rows:
+                        break
+                    updated += reservations.filter(pk__in=[pk for pk, _ in rows]).update(offering_id=targets[slug])
+                if dates is not None:
+                    dates.update(d for _, d in rows)
+    return updated
+
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from reservas.archive import ARCHIVE_BATCH_SIZE, archive_before, months_ago
+from reservas.models import Reservation
+
+
+class Command(BaseCommand):
+    help = 'Move reservations older than N months into ReservationArchive in small transactional batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=12, help='Archive reservations dated more than this many months ago')
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE, help='Reservations moved per transaction')
+        parser.add_argument('--limit', type=int, default=None, help='Stop after this many reservations')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many would be archived')
+
+    def handle(self, *args, **options):
+        if options['months'] < 1:
+            raise CommandError('--months debe ser al menos 1')
+        cutoff = months_ago(timezone.localdate(), options['months'])
+        if options['dry_run']:
+            pending = Reservation.objects.filter(date__lt=cutoff).count()
+            self.stdout.write(f'{pending} reservas anteriores a {cutoff} se archivarían')
+            return
+        moved = archive_before(cutoff, batch_size=options['batch_size'], limit=options['limit'])
+        self.stdout.write(self.style.SUCCESS(f'✅ {moved} reservas anteriores a {cutoff} archivadas'))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from reservas import stats
+from reservas.legacy import MIGRATION_BATCH_SIZE, assign_offerings, plan
+from reservas.models import Offering, Reservation, ReservationArchive
+
+
+class Command(BaseCommand):
+    help = 'Assign the equivalent Offering to reservations that only have a legacy service (runs in migration 0012).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=MIGRATION_BATCH_SIZE, help='Reservations updated per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be assigned')
+
+    def handle(self, *args, **options):
+        querysets = [Reservation.objects.all(), ReservationArchive.objects.all()]
+        report = plan(querysets, Offering.objects.all())
+        for row in report:
+            if row['slug'] is None:
+                target = 'sin equivalencia (se quedan sin oferta, 60 min)'
+            elif not row['exists']:
+                target = f"{row['slug']} no existe (se quedan sin oferta; créala y vuelve a ejecutar)"
+            else:
+                target = f"{row['slug']} ({row['duration_minutes']} min)"
+            self.stdout.write(f"{row['service']}: {row['count']} reservas -> {target}")
+        pending = any(row['exists'] for row in report)
+        if not pending:
+            self.stdout.write('No quedan reservas con servicio heredado que asignar')
+        if options['dry_run']:
+            return
+        updated = assign_offerings(querysets, Offering.objects.all(), batch_size=options['batch_size']) if pending else 0
+        # update() skips the signals that keep DailyStats in sync; rebuilt even
+        # with nothing pending, to fix stats left stale by an earlier assignment
+        days = stats.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f'✅ {updated} reservas con oferta asignada ({days} días de estadísticas recalculados)'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from reservas import assets
+
+
+class Command(BaseCommand):
+    help = 'Concatenate and minify the CSS/JS bundles and extract the critical CSS of the home page.'
+
+    def handle(self, *args, **options):
+        report = assets.build()
+        for path, sizes in report.items():
+            self.stdout.write(f"{path}: {sizes['source_bytes'] // 1024} KB -> {sizes['bytes'] // 1024} KB")
+        self.stdout.write(self.style.SUCCESS(f'✅ Bundles generados en {assets.OUTPUT_PREFIX}/'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from natursur import sessions
+
+
+class Command(BaseCommand):
+    help = 'Delete expired sessions in batches (run daily, e.g. from cron). Like clearsessions, without one huge DELETE.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=sessions.CLEAR_BATCH_SIZE, help='Sessions deleted per statement')
+
+    def handle(self, *args, **options):
+        if sessions.session_model() is None:
+            self.stdout.write('Las sesiones no se guardan en la base de datos: no hay nada que limpiar')
+            return
+        deleted = sessions.clear_expired(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'✅ {deleted} sesiones caducadas eliminadas'))
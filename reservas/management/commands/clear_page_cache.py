@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from natursur.caching import clear_page_cache, is_shared_cache
+
+
+class Command(BaseCommand):
+    help = 'Invalidate the cached anonymous pages (run on every deploy, see Procfile).'
+
+    def handle(self, *args, **options):
+        if not is_shared_cache():
+            # The release process has its own, empty cache: nothing to tell the new workers
+            self.stdout.write('Caché por proceso: los workers arrancan con ella vacía, nada que invalidar')
+            return
+        generation = clear_page_cache()
+        self.stdout.write(self.style.SUCCESS(f'✅ Caché de páginas invalidada (generación {generation})'))
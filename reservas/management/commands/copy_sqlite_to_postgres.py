@@ -0,0 +1,92 @@
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.core.serializers import sort_dependencies
+from django.db import connections, transaction
+
+SOURCE_ALIAS = 'sqlite_source'
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy every table from an existing SQLite file into the configured database '
+        '(PostgreSQL via DATABASE_URL) in batches. Run `migrate` on the target first; '
+        'its current rows are replaced.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', default=str(settings.BASE_DIR / 'db.sqlite3'), help='SQLite file to copy from')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per INSERT batch')
+        parser.add_argument('--database', default='default', help='Target database alias')
+
+    def handle(self, *args, **options):
+        source = Path(options['source'])
+        if not source.exists():
+            raise CommandError(f'No existe el fichero {source}')
+        target = connections[options['database']]
+        if target.vendor == 'sqlite' and Path(target.settings_dict['NAME']).resolve() == source.resolve():
+            raise CommandError('El origen y el destino son la misma base de datos. Configura DATABASE_URL.')
+
+        connections.settings[SOURCE_ALIAS] = connections.configure_settings({
+            'default': connections.settings['default'],
+            SOURCE_ALIAS: {
+                'ENGINE': 'django.db.backends.sqlite3',
+                # Read-only and untuned: the source file must come out exactly as it went in
+                # (the WAL journal mode, for one, would be written into it)
+                'NAME': f'file:{source.resolve()}?mode=ro',
+                'SQLITE_PRAGMAS': {},
+            },
+        })[SOURCE_ALIAS]
+
+        try:
+            models = self._models()
+            batch_size = options['batch_size']
+            with transaction.atomic(using=target.alias):
+                tables = [m._meta.db_table for m in models]
+                target.ops.execute_sql_flush(target.ops.sql_flush(no_style(), tables, allow_cascade=True))
+                for model in models:
+                    copied = self._copy(model, target.alias, batch_size)
+                    self.stdout.write(f'  {model._meta.label}: {copied}')
+                with target.cursor() as cursor:
+                    for sql in target.ops.sequence_reset_sql(no_style(), models):
+                        cursor.execute(sql)
+        finally:
+            # Forget the alias so another run in this process can use a different file
+            connections[SOURCE_ALIAS].close()
+            del connections[SOURCE_ALIAS]
+            del connections.settings[SOURCE_ALIAS]
+        self.stdout.write(self.style.SUCCESS(f'✅ {len(models)} tablas copiadas desde {source}'))
+
+    def _models(self):
+        """Concrete models (including M2M tables) in dependency order."""
+        source_tables = set(connections[SOURCE_ALIAS].introspection.table_names())
+        app_list = [(config, None) for config in apps.get_app_configs()]
+        ordered = sort_dependencies(app_list, allow_cycles=True)
+        through = [
+            f.remote_field.through
+            for model in ordered
+            for f in model._meta.local_many_to_many
+            if f.remote_field.through._meta.auto_created
+        ]
+        return [
+            m for m in ordered + through
+            if m._meta.managed and not m._meta.proxy and m._meta.db_table in source_tables
+        ]
+
+    def _copy(self, model, alias, batch_size):
+        rows = model._base_manager.using(SOURCE_ALIAS).order_by('pk').iterator(chunk_size=batch_size)
+        batch = []
+        copied = 0
+        for obj in rows:
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                model._base_manager.using(alias).bulk_create(batch)
+                copied += len(batch)
+                batch = []
+        if batch:
+            model._base_manager.using(alias).bulk_create(batch)
+            copied += len(batch)
+        return copied
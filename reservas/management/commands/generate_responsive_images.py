@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reservas import images
+
+
+class Command(BaseCommand):
+    help = 'Generate WebP/AVIF variants of the large static images at several widths, plus their manifest.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate variants that are already up to date')
+        parser.add_argument('--widths', default=','.join(map(str, images.WIDTHS)), help='Comma-separated widths in pixels')
+
+    def handle(self, *args, **options):
+        try:
+            widths = tuple(int(w) for w in options['widths'].split(','))
+        except ValueError:
+            raise CommandError('--widths debe ser una lista de enteros separados por comas')
+        formats = images.available_formats()
+        manifest = images.generate(widths=widths, formats=formats, force=options['force'])
+        for source, entry in manifest.items():
+            sizes = ', '.join(
+                f"{fmt} {v['width']}w {v['bytes'] // 1024} KB"
+                for fmt, variants in entry['variants'].items() for v in variants
+            )
+            self.stdout.write(f"{source} ({entry['width']}x{entry['height']}, {entry['bytes'] // 1024} KB): {sizes}")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Variantes {'/'.join(formats)} generadas en {images.OUTPUT_PREFIX}/ ({images.MANIFEST_NAME})"
+        ))
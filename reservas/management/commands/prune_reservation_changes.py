@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from reservas.changes import prune
+
+
+class Command(BaseCommand):
+    help = 'Delete old entries from the reservation change log used by the live panel (run daily, e.g. from cron).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='Keep entries newer than this many days')
+
+    def handle(self, *args, **options):
+        deleted = prune(days=options['days'])
+        self.stdout.write(self.style.SUCCESS(f'✅ {deleted} cambios antiguos eliminados'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reservas.stats import rebuild_all
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the DailyStats summary table used by the admin dashboard from scratch.'
+
+    def handle(self, *args, **options):
+        days = rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f'✅ Estadísticas diarias reconstruidas ({days} días)'))
@@ -0,0 +1,16 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from reservas.models import Reservation
+from reservas.search import fts_available, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the SQLite FTS5 search index for reservations and clients.'
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            self.stdout.write(self.style.WARNING('⚠️  No hay índice FTS5 (sólo SQLite); nada que reconstruir.'))
+            return
+        rows = rebuild_index(Reservation.objects.all(), get_user_model().objects.all())
+        self.stdout.write(self.style.SUCCESS(f'✅ Índice de búsqueda reconstruido ({rows} filas)'))
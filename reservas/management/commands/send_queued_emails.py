@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reservas.notifications import SEND_BATCH_SIZE, send_queued
+
+
+class Command(BaseCommand):
+    help = 'Send pending notification emails from the queue in batches (run periodically, e.g. from cron, or with --interval).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=SEND_BATCH_SIZE, help='Emails per batch (max 100)')
+        parser.add_argument('--limit', type=int, default=None, help='Stop after this many emails')
+        parser.add_argument('--interval', type=int, default=None,
+                            help='Keep running, checking the queue every this many seconds (worker process)')
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_queued(batch_size=options['batch_size'], limit=options['limit'])
+            if sent or failed or options['interval'] is None:
+                self.stdout.write(self.style.SUCCESS(f'✅ {sent} emails enviados'))
+            if failed:
+                self.stdout.write(self.style.WARNING(f'⚠️  {failed} emails fallidos (se reintentarán)'))
+            if options['interval'] is None:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,41 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from natursur.database import REPLICA_ALIAS
+
+
+class Command(BaseCommand):
+    help = (
+        'Copy the primary SQLite database onto the replica file (REPLICA_DATABASE_URL=sqlite:///...) '
+        'with the online backup API, to try the replica router locally.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0,
+                            help='Keep copying every N seconds (simulates replication lag); 0 = copy once')
+
+    def handle(self, *args, **options):
+        if REPLICA_ALIAS not in connections.settings:
+            raise CommandError('No hay réplica configurada: define REPLICA_DATABASE_URL.')
+        primary = connections['default'].settings_dict
+        replica = connections[REPLICA_ALIAS].settings_dict
+        if connections['default'].vendor != 'sqlite' or connections[REPLICA_ALIAS].vendor != 'sqlite':
+            raise CommandError('Solo para SQLite; con PostgreSQL usa la replicación del servidor.')
+        while True:
+            self._copy(str(primary['NAME']), str(replica['NAME']))
+            self.stdout.write(self.style.SUCCESS(f'✅ Réplica actualizada ({replica["NAME"]})'))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
+
+    def _copy(self, source, target):
+        src = sqlite3.connect(source)
+        dst = sqlite3.connect(target)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+            src.close()
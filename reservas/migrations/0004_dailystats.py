@@ -0,0 +1,87 @@
+# Generated by Django 4.2.10 on 2026-10-19 07:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_daily_stats(apps, schema_editor):
+    """Fill DailyStats from the existing reservations and users.
+
+    Frozen copy of reservas.stats.rebuild_all as of this migration (no
+    cancellations or archive table yet), so later changes to that module can't
+    break it.
+    """
+    from decimal import Decimal
+    from django.db.models import Count
+    from django.db.models.functions import TruncDate
+    from django.utils import timezone
+
+    Reservation = apps.get_model('reservas', 'Reservation')
+    DailyStats = apps.get_model('reservas', 'DailyStats')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+
+    summary = {}
+
+    def day(d):
+        return summary.setdefault(d, {
+            'reservations_count': 0, 'booked_minutes': 0, 'revenue_eur': Decimal('0'),
+            'revenue_by_offering': {}, 'new_clients': 0,
+        })
+
+    rows = (
+        Reservation.objects.order_by()
+        .values('date', 'offering_id', 'offering__duration_minutes', 'offering__price_eur')
+        .annotate(n=Count('id'))
+    )
+    for row in rows:
+        values = day(row['date'])
+        n = row['n']
+        price = row['offering__price_eur'] or Decimal('0')
+        values['reservations_count'] += n
+        values['booked_minutes'] += n * (row['offering__duration_minutes'] or 60)
+        values['revenue_eur'] += n * price
+        if row['offering_id'] is not None:
+            key = str(row['offering_id'])
+            values['revenue_by_offering'][key] = str(Decimal(values['revenue_by_offering'].get(key, '0')) + n * price)
+    clients = (
+        User.objects.filter(is_staff=False)
+        .annotate(day=TruncDate('date_joined', tzinfo=timezone.get_current_timezone()))
+        .order_by().values('day').annotate(n=Count('id'))
+    )
+    for row in clients:
+        day(row['day'])['new_clients'] = row['n']
+
+    DailyStats.objects.bulk_create(
+        [DailyStats(date=d, **values) for d, values in sorted(summary.items())], batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reservas', '0003_alter_reservation_phone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='Fecha')),
+                ('reservations_count', models.PositiveIntegerField(default=0)),
+                ('booked_minutes', models.PositiveIntegerField(default=0)),
+                ('revenue_eur', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('revenue_by_offering', models.JSONField(blank=True, default=dict)),
+                ('new_clients', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Estadística diaria',
+                'verbose_name_plural': 'Estadísticas diarias',
+                'ordering': ['date'],
+            },
+        ),
+        # Without it the dashboard shows zeros until someone runs rebuild_daily_stats
+        migrations.RunPython(build_daily_stats, migrations.RunPython.noop),
+    ]
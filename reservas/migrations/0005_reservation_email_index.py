@@ -0,0 +1,25 @@
+# Generated by Django 4.2.10 on 2026-10-19 07:24
+
+from django.db import migrations, models
+from django.db.models.functions import Lower, Trim
+
+
+def normalize_emails(apps, schema_editor):
+    """Store existing reservation emails in the canonical lower-case form."""
+    Reservation = apps.get_model('reservas', 'Reservation')
+    Reservation.objects.update(email=Lower(Trim('email')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservas', '0004_dailystats'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_emails, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['email'], name='reserva_email_idx'),
+        ),
+    ]
@@ -0,0 +1,76 @@
+import re
+
+from django.db import migrations
+
+FTS_TABLE = 'reservas_search_fts'
+BATCH_SIZE = 1000
+
+# Expression indexes matching the UPPER(...) LIKE UPPER(...) that icontains generates
+PG_TRGM_INDEXES = [
+    ('reserva_name_trgm', 'reservas_reservation', 'name'),
+    ('reserva_email_trgm', 'reservas_reservation', 'email'),
+    ('reserva_phone_trgm', 'reservas_reservation', 'phone'),
+    ('reservas_user_username_trgm', 'auth_user', 'username'),
+    ('reservas_user_email_trgm', 'auth_user', 'email'),
+    ('reservas_user_first_name_trgm', 'auth_user', 'first_name'),
+    ('reservas_user_last_name_trgm', 'auth_user', 'last_name'),
+]
+
+
+def _fts_rows(apps):
+    """FTS rows for the existing reservations and users. Frozen copy of what
+    reservas.search indexes: rowids interleave reservations (even) and users
+    (odd), and phones are stored as digits only.
+    """
+    for r in apps.get_model('reservas', 'Reservation').objects.order_by('pk').iterator(chunk_size=BATCH_SIZE):
+        yield [r.pk * 2, 'r', r.pk, r.name, r.email, re.sub(r'\D', '', r.phone or '')]
+    for u in apps.get_model('auth', 'User').objects.order_by('pk').iterator(chunk_size=BATCH_SIZE):
+        yield [u.pk * 2 + 1, 'u', u.pk, f'{u.username} {u.first_name} {u.last_name}'.strip(), u.email, '']
+
+
+def create_search_index(apps, schema_editor):
+    conn = schema_editor.connection
+    if conn.vendor == 'sqlite':
+        insert = f'INSERT INTO {FTS_TABLE} (rowid, kind, object_id, name, email, phone) VALUES (%s, %s, %s, %s, %s, %s)'
+        with conn.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                "kind UNINDEXED, object_id UNINDEXED, name, email, phone, tokenize='trigram')"
+            )
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            batch = []
+            for row in _fts_rows(apps):
+                batch.append(row)
+                if len(batch) >= BATCH_SIZE:
+                    cursor.executemany(insert, batch)
+                    batch = []
+            if batch:
+                cursor.executemany(insert, batch)
+    elif conn.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for name, table, column in PG_TRGM_INDEXES:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin (UPPER({column}::text) gin_trgm_ops)'
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    conn = schema_editor.connection
+    if conn.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+        conn._reservas_fts_available = False
+    elif conn.vendor == 'postgresql':
+        for name, _table, _column in PG_TRGM_INDEXES:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('reservas', '0006_reservation_status_queuedemail'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.10 on 2026-10-19 07:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservas', '0007_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservationChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reservation_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('created', 'Creada'), ('updated', 'Modificada'), ('cancelled', 'Cancelada'), ('deleted', 'Eliminada')], max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Cambio de reserva',
+                'verbose_name_plural': 'Cambios de reservas',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.10 on 2026-10-19 07:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservas', '0008_reservationchange'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reservation',
+            name='offering',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reservations', to='reservas.offering'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['date', 'time'], name='reserva_date_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['created_at'], name='reserva_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['offering', 'date'], name='reserva_offering_date_idx'),
+        ),
+    ]
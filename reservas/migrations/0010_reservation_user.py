@@ -0,0 +1,27 @@
+# Generated by Django 4.2.10 on 2026-10-19 07:52
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reservas', '0009_reservation_hot_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reservation',
+            name='user',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reservations', to=settings.AUTH_USER_MODEL),
+        ),
+        # No backfill by email: existing bookings are linked only after the
+        # account verifies its address (reservas.accounts.link_user)
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['user', 'date'], name='reserva_user_date_idx'),
+        ),
+    ]
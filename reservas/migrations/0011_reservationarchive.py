@@ -0,0 +1,40 @@
+# Generated by Django 4.2.10 on 2026-10-19 07:58
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('reservas', '0010_reservation_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservationArchive',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100, verbose_name='Nombre')),
+                ('email', models.EmailField(max_length=254, verbose_name='Email')),
+                ('phone', models.CharField(max_length=20, verbose_name='Teléfono')),
+                ('service', models.CharField(blank=True, choices=[('masaje', 'Masaje y Osteopatía'), ('biomagnetico', 'Par Biomagnético'), ('emocionales', 'Técnicas Emocionales'), ('nutricional', 'Asesoramiento Nutricional y Estilo de Vida')], max_length=20, verbose_name='Servicio')),
+                ('date', models.DateField(verbose_name='Fecha')),
+                ('time', models.TimeField(verbose_name='Hora')),
+                ('notes', models.TextField(blank=True, verbose_name='Notas')),
+                ('status', models.CharField(choices=[('confirmed', 'Confirmada'), ('cancelled', 'Cancelada')], default='confirmed', max_length=10, verbose_name='Estado')),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('offering', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_reservations', to='reservas.offering')),
+                ('user', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_reservations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Reserva archivada',
+                'verbose_name_plural': 'Reservas archivadas',
+                'ordering': ['-date', 'time'],
+                'indexes': [models.Index(fields=['date'], name='archivo_date_idx'), models.Index(fields=['email'], name='archivo_email_idx'), models.Index(fields=['offering', 'date'], name='archivo_offering_date_idx'), models.Index(fields=['user', 'date'], name='archivo_user_date_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,90 @@
+from decimal import Decimal
+
+from django.db import migrations, transaction
+from django.db.models import Count
+
+# Frozen copy of reservas.legacy at the time of this migration
+SERVICE_OFFERING_SLUGS = {
+    'masaje': 'sesion-60',
+    'biomagnetico': 'sesion-60',
+    'emocionales': 'sesion-40',
+    'nutricional': 'sesion-60',
+}
+BATCH_SIZE = 500
+DEFAULT_DURATION_MINUTES = 60
+
+
+def assign_offerings(querysets, offerings, dates):
+    """Set `offering` on reservations that only have a legacy `service`, in
+    batches of ids. Only offerings that already exist are used; the rest keep
+    their service (see `assign_legacy_offerings --dry-run`).
+    """
+    targets = dict(offerings.filter(slug__in=set(SERVICE_OFFERING_SLUGS.values())).values_list('slug', 'pk'))
+    for reservations in querysets:
+        for service, slug in SERVICE_OFFERING_SLUGS.items():
+            if slug not in targets:
+                continue
+            pending = reservations.filter(service=service, offering__isnull=True)
+            while True:
+                with transaction.atomic(using=reservations.db):
+                    rows = list(pending.order_by('pk').values_list('pk', 'date')[:BATCH_SIZE])
+                    if not rows:
+                        break
+                    reservations.filter(pk__in=[pk for pk, _ in rows]).update(offering_id=targets[slug])
+                dates.update(d for _, d in rows)
+
+
+def refresh_stats(dates, querysets, daily_stats):
+    """Recompute booked minutes and revenue of the DailyStats rows of `dates`:
+    update() skips the signals that keep them in sync. The reservation and
+    new-client counts don't change.
+    """
+    dates = sorted(dates)
+    for i in range(0, len(dates), BATCH_SIZE):
+        chunk = dates[i:i + BATCH_SIZE]
+        summary = {d: {'booked_minutes': 0, 'revenue_eur': Decimal('0'), 'revenue_by_offering': {}} for d in chunk}
+        for reservations in querysets:
+            rows = (
+                reservations.filter(date__in=chunk, status='confirmed').order_by()
+                .values('date', 'offering_id', 'offering__duration_minutes', 'offering__price_eur')
+                .annotate(n=Count('pk'))
+            )
+            for row in rows:
+                day = summary[row['date']]
+                n = row['n']
+                price = row['offering__price_eur'] or Decimal('0')
+                day['booked_minutes'] += n * (row['offering__duration_minutes'] or DEFAULT_DURATION_MINUTES)
+                day['revenue_eur'] += n * price
+                if row['offering_id'] is not None:
+                    key = str(row['offering_id'])
+                    day['revenue_by_offering'][key] = day['revenue_by_offering'].get(key, Decimal('0')) + n * price
+        with transaction.atomic(using=daily_stats.db):
+            for d, values in summary.items():
+                values['revenue_by_offering'] = {k: str(v) for k, v in values['revenue_by_offering'].items()}
+                daily_stats.filter(date=d).update(**values)
+
+
+def assign_legacy_offerings(apps, schema_editor):
+    """Give every reservation that only has a legacy `service` its equivalent
+    offering, and recompute the stats of the days it touched.
+    """
+    Reservation = apps.get_model('reservas', 'Reservation')
+    ReservationArchive = apps.get_model('reservas', 'ReservationArchive')
+    Offering = apps.get_model('reservas', 'Offering')
+    DailyStats = apps.get_model('reservas', 'DailyStats')
+    querysets = [Reservation.objects.all(), ReservationArchive.objects.all()]
+    dates = set()
+    assign_offerings(querysets, Offering.objects.all(), dates)
+    refresh_stats(dates, querysets, DailyStats.objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservas', '0011_reservationarchive'),
+    ]
+
+    operations = [
+        # Reversing keeps the assigned offerings: the legacy `service` values are untouched
+        migrations.RunPython(assign_legacy_offerings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.10 on 2026-10-19 09:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservas', '0014_queuedemail_claimed_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['status', 'date', 'time'], name='reserva_status_date_idx'),
+        ),
+    ]
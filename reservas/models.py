@@ -1,9 +1,15 @@
 from django.db import models
+from django.conf import settings
 from datetime import datetime, timedelta, time as dtime
 from django.core.validators import RegexValidator
 import re
 
 
+def normalize_email(value) -> str:
+    """Canonical form used to match reservations with user accounts by email."""
+    return (value or '').strip().lower()
+
+
 class Offering(models.Model):
     """Servicio/oferta: duración en minutos y precio en euros."""
     slug = models.SlugField(max_length=50, unique=True)
@@ -15,11 +21,50 @@ class Offering(models.Model):
         verbose_name = "Oferta"
         verbose_name_plural = "Ofertas"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored price and duration, so a change can refresh the revenue/occupancy stats
+        if 'price_eur' in field_names and 'duration_minutes' in field_names:
+            instance._loaded_pricing = (
+                values[field_names.index('price_eur')], values[field_names.index('duration_minutes')],
+            )
+        return instance
+
     def __str__(self) -> str:
         return f"{self.name} — €{self.price_eur}"
 
 
+class CatalogVersion(models.Model):
+    """Fila única con la versión publicada del catálogo de ofertas (`reservas.catalog`).
+
+    Vive en la base de datos para que todos los workers la compartan aunque la
+    caché de Django sea local a cada proceso.
+    """
+    token = models.CharField(max_length=32)
+
+    class Meta:
+        verbose_name = "Versión del catálogo"
+        verbose_name_plural = "Versión del catálogo"
+
+    def __str__(self) -> str:
+        return self.token
+
+
+class ReservationQuerySet(models.QuerySet):
+    def active(self):
+        """Reservations that still hold their slot (not cancelled)."""
+        return self.filter(status=Reservation.STATUS_CONFIRMED)
+
+
 class Reservation(models.Model):
+    STATUS_CONFIRMED = "confirmed"
+    STATUS_CANCELLED = "cancelled"
+    STATUS_CHOICES = [
+        (STATUS_CONFIRMED, "Confirmada"),
+        (STATUS_CANCELLED, "Cancelada"),
+    ]
+
     SERVICE_CHOICES = [
         ("masaje", "Masaje y Osteopatía"),
         ("biomagnetico", "Par Biomagnético"),
@@ -36,22 +81,61 @@ class Reservation(models.Model):
             code='invalid_phone'
         )
     ])
-    # Legacy: SERVICE_CHOICES kept for compatibility, but prefer `offering`.
+    # Legacy: no longer set by the booking form. Old values were mapped to an
+    # offering by migration 0012 (see reservas.legacy); kept for history only.
     service = models.CharField("Servicio", max_length=20, choices=SERVICE_CHOICES, blank=True)
-    offering = models.ForeignKey('reservas.Offering', null=True, blank=True, on_delete=models.SET_NULL, related_name='reservations')
+    # Indexed through reserva_offering_date_idx (offering is its first column)
+    offering = models.ForeignKey('reservas.Offering', null=True, blank=True, on_delete=models.SET_NULL, related_name='reservations', db_index=False)
+    # Account that made the booking (or whose email matches); null for guest bookings.
+    # Indexed through reserva_user_date_idx
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL,
+                             related_name='reservations', db_index=False)
     date = models.DateField("Fecha")
     time = models.TimeField("Hora")
     notes = models.TextField("Notas", blank=True)
+    status = models.CharField("Estado", max_length=10, choices=STATUS_CHOICES, default=STATUS_CONFIRMED)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ReservationQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Reserva"
         verbose_name_plural = "Reservas"
         ordering = ["-date", "time"]
+        indexes = [
+            # Reservations are linked to clients by (normalized) email
+            models.Index(fields=["email"], name="reserva_email_idx"),
+            # Availability, form validation, calendar and list ordering (-date, -time)
+            models.Index(fields=["date", "time"], name="reserva_date_time_idx"),
+            models.Index(fields=["created_at"], name="reserva_created_idx"),
+            # Per-offering filters and reports over a date range
+            models.Index(fields=["offering", "date"], name="reserva_offering_date_idx"),
+            # "Mis reservas"
+            models.Index(fields=["user", "date"], name="reserva_user_date_idx"),
+            # Admin changelist filtered by status, in list order
+            models.Index(fields=["status", "date", "time"], name="reserva_status_date_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.email = normalize_email(self.email)
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember stored values so signal handlers can tell what changed
+        # (both days' stats on a move, cancellations for the change log)
+        if 'date' in field_names:
+            instance._loaded_date = values[field_names.index('date')]
+        if 'status' in field_names:
+            instance._loaded_status = values[field_names.index('status')]
+        return instance
 
     def __str__(self) -> str:
-        label = self.get_service_display() if self.offering is None else self.offering.name
-        return f"{self.name} - {label} ({self.date} {self.time})"
+        # Never fetch the offering just to print a label (admin lists, logs)
+        if self.offering_id and Reservation.offering.is_cached(self):
+            return f"{self.name} - {self.offering.name} ({self.date} {self.time})"
+        return f"{self.name} ({self.date} {self.time})"
 
     @property
     def start_datetime(self) -> datetime:
@@ -59,11 +143,123 @@ class Reservation(models.Model):
 
     @property
     def end_datetime(self) -> datetime:
-        minutes = 60
-        if self.offering and self.offering.duration_minutes:
-            minutes = int(self.offering.duration_minutes)
-        elif self.service:
-            # best-effort mapping from legacy choices
-            mapping = {'masaje': 60, 'biomagnetico': 60, 'emocionales': 40, 'nutricional': 60}
-            minutes = mapping.get(self.service, 60)
-        return self.start_datetime + timedelta(minutes=minutes)
+        from . import catalog
+        return self.start_datetime + timedelta(minutes=catalog.duration_minutes(self.offering_id))
+
+
+class ReservationArchive(models.Model):
+    """Cold copy of old reservations moved out of the live table
+    (`archive_reservations`). Keeps the original id. Only reporting reads it;
+    availability and the panel work on `Reservation` alone.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField("Nombre", max_length=100)
+    email = models.EmailField("Email")
+    phone = models.CharField("Teléfono", max_length=20)
+    service = models.CharField("Servicio", max_length=20, choices=Reservation.SERVICE_CHOICES, blank=True)
+    offering = models.ForeignKey('reservas.Offering', null=True, blank=True, on_delete=models.SET_NULL,
+                                 related_name='archived_reservations', db_index=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL,
+                             related_name='archived_reservations', db_index=False)
+    date = models.DateField("Fecha")
+    time = models.TimeField("Hora")
+    notes = models.TextField("Notas", blank=True)
+    status = models.CharField("Estado", max_length=10, choices=Reservation.STATUS_CHOICES, default=Reservation.STATUS_CONFIRMED)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    objects = ReservationQuerySet.as_manager()
+
+    # Fields copied from Reservation when archiving
+    COPIED_FIELDS = ("id", "name", "email", "phone", "service", "offering_id", "user_id",
+                     "date", "time", "notes", "status", "created_at")
+
+    class Meta:
+        verbose_name = "Reserva archivada"
+        verbose_name_plural = "Reservas archivadas"
+        ordering = ["-date", "time"]
+        indexes = [
+            models.Index(fields=["date"], name="archivo_date_idx"),
+            models.Index(fields=["email"], name="archivo_email_idx"),
+            models.Index(fields=["offering", "date"], name="archivo_offering_date_idx"),
+            models.Index(fields=["user", "date"], name="archivo_user_date_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.date} {self.time}) [archivada]"
+
+
+class ReservationChange(models.Model):
+    """Registro de cambios en reservas; su id es el cursor monotónico del panel en directo."""
+    ACTION_CREATED = "created"
+    ACTION_UPDATED = "updated"
+    ACTION_CANCELLED = "cancelled"
+    ACTION_DELETED = "deleted"
+    ACTION_CHOICES = [
+        (ACTION_CREATED, "Creada"),
+        (ACTION_UPDATED, "Modificada"),
+        (ACTION_CANCELLED, "Cancelada"),
+        (ACTION_DELETED, "Eliminada"),
+    ]
+
+    # Plain id (not a FK) so entries survive the reservation being deleted
+    reservation_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        verbose_name = "Cambio de reserva"
+        verbose_name_plural = "Cambios de reservas"
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"#{self.id} {self.action} reserva {self.reservation_id}"
+
+
+class QueuedEmail(models.Model):
+    """Email pendiente de envío; se envían por lotes con `manage.py send_queued_emails`."""
+    to = models.EmailField()
+    subject = models.CharField(max_length=200)
+    text = models.TextField()
+    html = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    # Set by the sender that took the row, so overlapping runs don't send it twice
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = "Email en cola"
+        verbose_name_plural = "Emails en cola"
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["sent_at", "attempts"], name="queuedemail_pending_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.to}: {self.subject}"
+
+
+class DailyStats(models.Model):
+    """Resumen diario para el dashboard (reservas, ingresos, ocupación, altas).
+
+    Se mantiene incrementalmente desde `reservas.signals` y puede reconstruirse
+    con `python manage.py rebuild_daily_stats`.
+    """
+    date = models.DateField("Fecha", unique=True)
+    reservations_count = models.PositiveIntegerField(default=0)
+    booked_minutes = models.PositiveIntegerField(default=0)
+    revenue_eur = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    # {"<offering_id>": "<importe>"}; ids se resuelven a nombres al mostrar
+    revenue_by_offering = models.JSONField(default=dict, blank=True)
+    new_clients = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Estadística diaria"
+        verbose_name_plural = "Estadísticas diarias"
+        ordering = ["date"]
+
+    def __str__(self) -> str:
+        return f"{self.date}: {self.reservations_count} reservas, €{self.revenue_eur}"
@@ -0,0 +1,150 @@
+"""Cola de emails de notificación (patrón outbox).
+
+Las acciones masivas del panel no envían emails en línea: insertan filas
+`QueuedEmail` con `bulk_create` dentro de la misma transacción que modifica
+las reservas, y `python manage.py send_queued_emails` las envía por lotes
+(Resend batch API si hay API key; si no, el backend de email de Django).
+Cada lote se reclama antes de enviarlo (`claimed_at`), así que dos
+ejecuciones solapadas del comando nunca envían el mismo email.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import QueuedEmail
+
+logger = logging.getLogger(__name__)
+
+# Resend acepta como máximo 100 emails por llamada batch
+SEND_BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+# A claim older than this belongs to a sender that died mid-batch
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+def _fmt_date(value):
+    return value.strftime('%d/%m/%Y') if value else ''
+
+
+def _fmt_time(value):
+    return value.strftime('%H:%M') if value else ''
+
+
+def cancellation_email(reservation):
+    """Build (unsaved) the cancellation notice for a reservation-like object."""
+    text = (
+        f"Hola {reservation.name},\n\n"
+        f"Lamentamos informarte de que tu cita del {_fmt_date(reservation.date)} "
+        f"a las {_fmt_time(reservation.time)} ha sido cancelada.\n\n"
+        f"Ponte en contacto con nosotros para buscar una nueva fecha.\n\n"
+        f"Natursur"
+    )
+    return QueuedEmail(to=reservation.email, subject="Cancelación de tu reserva - Natursur", text=text)
+
+
+def reschedule_email(reservation, old_date):
+    """Build (unsaved) the notice for a reservation moved from `old_date`."""
+    text = (
+        f"Hola {reservation.name},\n\n"
+        f"Tu cita del {_fmt_date(old_date)} a las {_fmt_time(reservation.time)} "
+        f"se ha trasladado al {_fmt_date(reservation.date)} a la misma hora.\n\n"
+        f"Si la nueva fecha no te viene bien, no dudes en contactarnos.\n\n"
+        f"Natursur"
+    )
+    return QueuedEmail(to=reservation.email, subject="Cambio de fecha de tu reserva - Natursur", text=text)
+
+
+def verification_email(user, url):
+    """Build (unsaved) the email with the link that verifies `user`'s address."""
+    text = (
+        f"Hola {user.get_username()},\n\n"
+        f"Confirma tu email abriendo este enlace (caduca en 3 días):\n{url}\n\n"
+        f"Al confirmarlo verás en «Mis reservas» las citas que reservaste con este "
+        f"email antes de crear tu cuenta.\n\n"
+        f"Natursur"
+    )
+    return QueuedEmail(to=user.email, subject="Confirma tu email - Natursur", text=text)
+
+
+def enqueue(emails):
+    """Insert the given unsaved QueuedEmail objects in batches. Returns how many."""
+    emails = [e for e in emails if e.to]
+    QueuedEmail.objects.bulk_create(emails, batch_size=SEND_BATCH_SIZE)
+    return len(emails)
+
+
+def _send_via_resend(batch):
+    import resend
+    resend.api_key = settings.RESEND_API_KEY
+    resend.Batch.send([
+        {
+            "from": settings.DEFAULT_FROM_EMAIL,
+            "to": e.to,
+            "subject": e.subject,
+            "text": e.text,
+            **({"html": e.html} if e.html else {}),
+        }
+        for e in batch
+    ])
+
+
+def _send_via_django(batch):
+    messages = []
+    for e in batch:
+        msg = EmailMultiAlternatives(e.subject, e.text, settings.DEFAULT_FROM_EMAIL, [e.to])
+        if e.html:
+            msg.attach_alternative(e.html, 'text/html')
+        messages.append(msg)
+    # One connection for the whole batch
+    get_connection().send_messages(messages)
+
+
+def _claim(size, last_id):
+    """Take up to `size` pending emails after `last_id` for this sender.
+    The rows are locked while they are marked (skipping those another sender
+    holds on PostgreSQL; SQLite's BEGIN IMMEDIATE serializes the senders).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            QueuedEmail.objects.select_for_update(skip_locked=True)
+            .filter(sent_at__isnull=True, attempts__lt=MAX_ATTEMPTS, id__gt=last_id)
+            .filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - CLAIM_TIMEOUT))
+            .order_by('id')[:size]
+        )
+        QueuedEmail.objects.filter(id__in=[e.id for e in batch]).update(claimed_at=now)
+    return batch
+
+
+def send_queued(batch_size=SEND_BATCH_SIZE, limit=None):
+    """Send pending queued emails in batches. Returns (sent, failed)."""
+    batch_size = max(1, min(batch_size, SEND_BATCH_SIZE))
+    sender = _send_via_resend if settings.RESEND_API_KEY else _send_via_django
+    sent = failed = 0
+    last_id = 0
+    while limit is None or sent + failed < limit:
+        size = batch_size if limit is None else min(batch_size, limit - sent - failed)
+        batch = _claim(size, last_id)
+        if not batch:
+            break
+        last_id = batch[-1].id
+        ids = [e.id for e in batch]
+        try:
+            sender(batch)
+        except Exception as e:
+            logger.error('❌ Failed to send %d queued emails: %s', len(batch), e)
+            for email in batch:
+                email.attempts += 1
+                email.last_error = str(e)
+                email.claimed_at = None
+            QueuedEmail.objects.bulk_update(batch, ['attempts', 'last_error', 'claimed_at'])
+            failed += len(batch)
+            continue
+        QueuedEmail.objects.filter(id__in=ids).update(sent_at=timezone.now(), last_error='')
+        sent += len(batch)
+    return sent, failed
@@ -0,0 +1,202 @@
+"""Búsqueda de reservas y clientes por nombre, email o teléfono parcial.
+
+- SQLite: tabla virtual FTS5 (`reservas_search_fts`, tokenizador trigram) que
+  indexa reservas y usuarios; se mantiene con señales (ver `signals.py`) y se
+  regenera con `python manage.py rebuild_search_index`.
+- PostgreSQL: índices GIN `pg_trgm` sobre `UPPER(col)`, que son exactamente
+  las expresiones que genera `icontains`, así que la búsqueda usa el índice.
+
+Cualquier otro backend cae en `icontains` sin índice.
+"""
+import re
+import threading
+from contextlib import contextmanager
+
+from django.db import connection, connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'reservas_search_fts'
+KIND_RESERVATION = 'r'
+KIND_USER = 'u'
+# The trigram tokenizer cannot match terms shorter than 3 characters
+MIN_TERM_LENGTH = 3
+
+_PHONE_TERM = re.compile(r'^[\d\s\-\(\)\+]+$')
+
+RESERVATION_FIELDS = ('name', 'email', 'phone')
+USER_FIELDS = ('username', 'email', 'first_name', 'last_name')
+# Largest IN list of a single DELETE
+UNINDEX_BATCH_SIZE = 500
+
+_batch = threading.local()
+
+
+def fts_available(conn=None):
+    """True when `conn` (the default connection if omitted) is SQLite and the FTS table exists."""
+    conn = conn or connection
+    if conn.vendor != 'sqlite':
+        return False
+    if getattr(conn, '_reservas_fts_available', False):
+        return True
+    with conn.cursor() as cursor:
+        available = FTS_TABLE in conn.introspection.table_names(cursor)
+    # Only positive results are cached, so the table is picked up right after migrate
+    conn._reservas_fts_available = available
+    return available
+
+
+def _digits(value):
+    return re.sub(r'\D', '', value or '')
+
+
+def _rowid(kind, object_id):
+    # Reservations and users share the table: interleave their ids
+    return object_id * 2 + (1 if kind == KIND_USER else 0)
+
+
+def _row_values(kind, obj):
+    if kind == KIND_RESERVATION:
+        return obj.name, obj.email, _digits(obj.phone)
+    full_name = f'{obj.username} {obj.first_name} {obj.last_name}'.strip()
+    return full_name, obj.email, ''
+
+
+def index_object(kind, obj, conn=None):
+    """Insert or refresh the FTS row for a reservation or user."""
+    conn = conn or connection
+    if not fts_available(conn):
+        return
+    rowid = _rowid(kind, obj.pk)
+    with conn.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [rowid])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, kind, object_id, name, email, phone) VALUES (%s, %s, %s, %s, %s, %s)',
+            [rowid, kind, obj.pk, *_row_values(kind, obj)],
+        )
+
+
+@contextmanager
+def unindex_batch():
+    """Collect the FTS rows removed inside the block (the post_delete handler
+    runs once per deleted row) and delete them when it exits, with one DELETE
+    per kind and UNINDEX_BATCH_SIZE ids.
+    """
+    if getattr(_batch, 'pending', None) is not None:
+        # Nested batch: the outermost one flushes
+        yield
+        return
+    _batch.pending = {}
+    try:
+        yield
+        pending = _batch.pending
+    finally:
+        _batch.pending = None
+    for (kind, alias), object_ids in pending.items():
+        unindex_objects(kind, object_ids, connections[alias])
+
+
+def unindex_object(kind, object_id, conn=None):
+    """Remove one FTS row now, or at the end of the current `unindex_batch`."""
+    pending = getattr(_batch, 'pending', None)
+    if pending is not None:
+        pending.setdefault((kind, (conn or connection).alias), []).append(object_id)
+    else:
+        unindex_objects(kind, [object_id], conn)
+
+
+def unindex_objects(kind, object_ids, conn=None):
+    """Remove the FTS rows of several reservations or users, by rowid (the
+    table's key), UNINDEX_BATCH_SIZE per DELETE.
+    """
+    conn = conn or connection
+    rowids = [_rowid(kind, object_id) for object_id in object_ids]
+    if not rowids or not fts_available(conn):
+        return
+    with conn.cursor() as cursor:
+        for start in range(0, len(rowids), UNINDEX_BATCH_SIZE):
+            chunk = rowids[start:start + UNINDEX_BATCH_SIZE]
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({", ".join(["%s"] * len(chunk))})', chunk)
+
+
+def rebuild_index(reservations, users, conn=None, batch_size=1000):
+    """Repopulate the FTS table from the given querysets. Returns rows indexed.
+    Takes querysets so it can also run from a migration with historical models.
+    """
+    conn = conn or connection
+    if not fts_available(conn):
+        return 0
+    total = 0
+    with conn.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        for kind, qs in ((KIND_RESERVATION, reservations), (KIND_USER, users)):
+            batch = []
+            for obj in qs.iterator(chunk_size=batch_size):
+                batch.append([_rowid(kind, obj.pk), kind, obj.pk, *_row_values(kind, obj)])
+                if len(batch) >= batch_size:
+                    _insert_rows(cursor, batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                _insert_rows(cursor, batch)
+                total += len(batch)
+    return total
+
+
+def _insert_rows(cursor, rows):
+    cursor.executemany(
+        f'INSERT INTO {FTS_TABLE} (rowid, kind, object_id, name, email, phone) VALUES (%s, %s, %s, %s, %s, %s)',
+        rows,
+    )
+
+
+def _match_expression(term):
+    """Split `term` into an FTS5 MATCH string (all words must match, None if no
+    word is long enough) and the words too short for the trigram index.
+    """
+    phrases = []
+    short = []
+    for word in term.split():
+        if _PHONE_TERM.match(word):
+            word = _digits(word) or word
+        if len(word) >= MIN_TERM_LENGTH:
+            phrases.append('"%s"' % word.replace('"', '""'))
+        else:
+            short.append(word)
+    return ' '.join(phrases) or None, short
+
+
+def _icontains(fields, words):
+    q = Q()
+    for word in words:
+        word_q = Q()
+        for field in fields:
+            word_q |= Q(**{f'{field}__icontains': word})
+        q &= word_q
+    return q
+
+
+def _search(qs, term, kind, fields):
+    term = (term or '').strip()
+    if not term:
+        return qs
+    if fts_available(connections[qs.db]):
+        match, short = _match_expression(term)
+        if match:
+            ids = RawSQL(
+                f'SELECT object_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND kind = %s',
+                (match, kind),
+            )
+            # Words the index can't match still have to match, on the rows it narrowed down
+            return qs.filter(pk__in=ids).filter(_icontains(fields, short))
+    return qs.filter(_icontains(fields, term.split()))
+
+
+def search_reservations(qs, term):
+    """Filter a Reservation queryset by partial name, email or phone."""
+    return _search(qs, term, KIND_RESERVATION, RESERVATION_FIELDS)
+
+
+def search_users(qs, term):
+    """Filter a User queryset by partial username, full name or email."""
+    return _search(qs, term, KIND_USER, USER_FIELDS)
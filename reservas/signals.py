@@ -0,0 +1,129 @@
+"""Signal handlers that keep derived data in sync with reservations and users."""
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import catalog, changes, search, stats
+from .models import CatalogVersion, Offering, Reservation, ReservationChange
+from natursur.database import configure_sqlite_connection
+
+
+@receiver(connection_created, dispatch_uid='natursur_sqlite_pragmas')
+def tune_sqlite_connection(sender, connection, **kwargs):
+    configure_sqlite_connection(connection, settings.SQLITE_CONNECTION_PRAGMAS)
+
+
+@receiver(post_save, sender=Reservation, dispatch_uid='reservas_stats_reservation_saved')
+def reservation_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    stats.mark_dirty(instance.date, getattr(instance, '_loaded_date', None))
+    instance._loaded_date = instance.date
+
+
+@receiver(post_delete, sender=Reservation, dispatch_uid='reservas_stats_reservation_deleted')
+def reservation_deleted(sender, instance, **kwargs):
+    stats.mark_dirty(instance.date, getattr(instance, '_loaded_date', None))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL, dispatch_uid='reservas_stats_user_saved')
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL, dispatch_uid='reservas_stats_user_deleted')
+def user_changed(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not instance.date_joined:
+        return
+    # Logins save only last_login: just sign-ups, deletions and staff changes move the counts
+    if update_fields is not None and not {'is_staff', 'date_joined'} & set(update_fields):
+        return
+    stats.mark_dirty(timezone.localdate(instance.date_joined), clients=True)
+
+
+@receiver(post_save, sender=Offering, dispatch_uid='reservas_stats_offering_saved')
+def offering_repriced(sender, instance, created=False, raw=False, **kwargs):
+    pricing = (instance.price_eur, instance.duration_minutes)
+    if not raw and not created and getattr(instance, '_loaded_pricing', None) != pricing:
+        stats.refresh_offering(instance.pk)
+    instance._loaded_pricing = pricing
+
+
+@receiver(pre_delete, sender=Offering, dispatch_uid='reservas_stats_offering_deleting')
+def offering_deleting(sender, instance, **kwargs):
+    # Its reservations lose the offering (SET_NULL, no signals): remember their days
+    instance._stats_dates = stats.offering_dates(instance.pk)
+
+
+@receiver(post_delete, sender=Offering, dispatch_uid='reservas_stats_offering_deleted')
+def offering_deleted(sender, instance, **kwargs):
+    stats.mark_dirty(*getattr(instance, '_stats_dates', ()))
+
+
+@receiver(post_save, sender=Reservation, dispatch_uid='reservas_search_reservation_saved')
+def reservation_indexed(sender, instance, raw=False, **kwargs):
+    # Fixtures (loaddata) are indexed afterwards with rebuild_search_index
+    if raw:
+        return
+    search.index_object(search.KIND_RESERVATION, instance)
+
+
+@receiver(post_delete, sender=Reservation, dispatch_uid='reservas_search_reservation_deleted')
+def reservation_unindexed(sender, instance, **kwargs):
+    search.unindex_object(search.KIND_RESERVATION, instance.pk)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL, dispatch_uid='reservas_search_user_saved')
+def user_indexed(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    # Logins save only last_login, which isn't indexed
+    if update_fields is not None and not set(search.USER_FIELDS) & set(update_fields):
+        return
+    search.index_object(search.KIND_USER, instance)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL, dispatch_uid='reservas_search_user_deleted')
+def user_unindexed(sender, instance, **kwargs):
+    search.unindex_object(search.KIND_USER, instance.pk)
+
+
+@receiver(post_save, sender=Reservation, dispatch_uid='reservas_changes_reservation_saved')
+def reservation_logged(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        action = ReservationChange.ACTION_CREATED
+    elif (instance.status == Reservation.STATUS_CANCELLED
+          and getattr(instance, '_loaded_status', None) != Reservation.STATUS_CANCELLED):
+        action = ReservationChange.ACTION_CANCELLED
+    else:
+        action = ReservationChange.ACTION_UPDATED
+    changes.record(instance.pk, action)
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=Reservation, dispatch_uid='reservas_changes_reservation_deleted')
+def reservation_delete_logged(sender, instance, **kwargs):
+    changes.record(instance.pk, ReservationChange.ACTION_DELETED)
+
+
+@receiver(post_save, sender=Offering, dispatch_uid='reservas_catalog_offering_saved')
+@receiver(post_delete, sender=Offering, dispatch_uid='reservas_catalog_offering_deleted')
+def offering_changed(sender, instance, **kwargs):
+    catalog.invalidate()
+
+
+# One read of the catalog version per request, however many offerings it looks up
+request_started.connect(catalog.begin_request, dispatch_uid='reservas_catalog_request_started')
+request_finished.connect(catalog.end_request, dispatch_uid='reservas_catalog_request_finished')
+
+
+@receiver(post_migrate, dispatch_uid='reservas_catalog_migrated')
+def catalog_migrated(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    # Data migrations and flush change offerings without model signals
+    if sender.label != 'reservas' or using != DEFAULT_DB_ALIAS:
+        return
+    connection = connections[using]
+    if CatalogVersion._meta.db_table in connection.introspection.table_names():
+        catalog.bump_version()
@@ -0,0 +1,195 @@
+// Scripts del panel de administración (antes en línea en cada plantilla).
+// Cada bloque comprueba que sus elementos existen: el bundle se carga en todo el panel.
+
+// Reservas: notas, selección múltiple, acciones masivas y cambios en directo
+function showNotes(notes) {
+  document.getElementById('notesText').textContent = notes;
+  document.getElementById('notesModal').style.display = 'flex';
+}
+
+function closeNotes() {
+  document.getElementById('notesModal').style.display = 'none';
+}
+
+// Selección múltiple y acciones masivas
+(function() {
+  var form = document.getElementById('bulkForm');
+  if (!form) return;
+  var counter = document.getElementById('selectedCount');
+  var action = document.getElementById('bulkAction');
+  function refresh() {
+    counter.textContent = form.querySelectorAll('.row-select:checked').length;
+  }
+  document.getElementById('selectAll').addEventListener('change', function() {
+    form.querySelectorAll('.row-select').forEach(function(b) { b.checked = this.checked; }, this);
+    refresh();
+  });
+  form.addEventListener('change', function(e) {
+    if (e.target.classList.contains('row-select')) refresh();
+  });
+  action.addEventListener('change', function() {
+    document.getElementById('bulkDays').style.display = this.value === 'reschedule' ? '' : 'none';
+  });
+  form.addEventListener('submit', function(e) {
+    var n = form.querySelectorAll('.row-select:checked').length;
+    var label = action.options[action.selectedIndex].text.toLowerCase();
+    if (!n || !confirm('¿' + label.charAt(0).toUpperCase() + label.slice(1) + ' ' + n + ' reservas?')) {
+      e.preventDefault();
+    }
+  });
+})();
+
+// Cambios en directo (SSE): se actualizan las filas sin recargar la página
+(function() {
+  var form = document.getElementById('bulkForm');
+  if (!form || !window.EventSource) return;
+  var tbody = form.querySelector('tbody');
+  var liveInsert = form.dataset.liveInsert === '1';
+  var source = new EventSource(form.dataset.events);
+  source.addEventListener('reservation', function(e) {
+    var change = JSON.parse(e.data);
+    var row = tbody.querySelector('tr[data-id="' + change.reservation_id + '"]');
+    if (change.action === 'deleted') {
+      if (row) row.remove();
+      return;
+    }
+    var tpl = document.createElement('tbody');
+    tpl.innerHTML = change.html.trim();
+    var fresh = tpl.firstElementChild;
+    if (row) {
+      fresh.querySelector('.row-select').checked = row.querySelector('.row-select').checked;
+      row.replaceWith(fresh);
+    } else if (change.action === 'created' && liveInsert) {
+      var empty = tbody.querySelector('.empty-row');
+      if (empty) empty.remove();
+      tbody.insertBefore(fresh, tbody.firstElementChild);
+    }
+  });
+})();
+
+// Abrir y cerrar el modal de notas (delegado: las filas llegan también en directo)
+(function() {
+  var modal = document.getElementById('notesModal');
+  if (!modal) return;
+  document.addEventListener('click', function(e) {
+    var button = e.target.closest('[data-notes]');
+    if (button) showNotes(button.dataset.notes);
+  });
+  modal.addEventListener('click', function(e) {
+    // Botones de cierre o clic fuera del contenido
+    if (e.target === this || e.target.closest('[data-close-notes]')) {
+      closeNotes();
+    }
+  });
+})();
+
+// Calendario
+(function() {
+  var el = document.getElementById('calendar');
+  if (!el) return;
+  var feedUrl = el.dataset.feed;
+  var startHour = parseInt(el.dataset.start, 10);
+  var endHour = parseInt(el.dataset.end, 10);
+  var HOUR_PX = 48;
+  var POLL_MS = 30000;
+  var view = 'week';
+  var current = new Date();
+  var etag = null;
+
+  function iso(d) {
+    var m = d.getMonth() + 1, day = d.getDate();
+    return d.getFullYear() + '-' + (m < 10 ? '0' : '') + m + '-' + (day < 10 ? '0' : '') + day;
+  }
+
+  function addDays(d, n) {
+    var r = new Date(d);
+    r.setDate(r.getDate() + n);
+    return r;
+  }
+
+  function visibleDays() {
+    if (view === 'day') return [new Date(current)];
+    var monday = addDays(current, -((current.getDay() + 6) % 7));
+    return [0, 1, 2, 3, 4].map(function(i) { return addDays(monday, i); });
+  }
+
+  function render(data) {
+    var days = visibleDays();
+    var byDate = {};
+    (data ? data.reservations : []).forEach(function(r) {
+      (byDate[r.date] = byDate[r.date] || []).push(r);
+    });
+
+    var html = '<div class="cal-grid" style="grid-template-columns: 56px repeat(' + days.length + ', 1fr)">';
+    html += '<div></div>';
+    days.forEach(function(d) {
+      var today = iso(d) === iso(new Date()) ? ' is-today' : '';
+      html += '<div class="cal-day-head' + today + '">' +
+        d.toLocaleDateString('es-ES', { weekday: 'short', day: 'numeric', month: 'short' }) + '</div>';
+    });
+    html += '<div class="cal-hours">';
+    for (var h = startHour; h < endHour; h++) {
+      html += '<div class="cal-hour" style="height:' + HOUR_PX + 'px">' + h + ':00</div>';
+    }
+    html += '</div>';
+    days.forEach(function(d) {
+      html += '<div class="cal-col" style="height:' + (endHour - startHour) * HOUR_PX + 'px">';
+      (byDate[iso(d)] || []).forEach(function(r) {
+        var parts = r.time.split(':');
+        var minutes = (parseInt(parts[0], 10) - startHour) * 60 + parseInt(parts[1], 10);
+        var top = minutes / 60 * HOUR_PX;
+        var height = Math.max(r.duration / 60 * HOUR_PX - 2, 18);
+        var cls = r.status === 'cancelled' ? ' is-cancelled' : '';
+        html += '<div class="cal-event' + cls + '" style="top:' + top + 'px;height:' + height + 'px" title="' +
+          escapeHtml(r.name + ' · ' + r.phone + ' · ' + r.offering) + '">' +
+          '<strong>' + r.time + '</strong> ' + escapeHtml(r.name) +
+          (r.offering ? '<br><small>' + escapeHtml(r.offering) + '</small>' : '') + '</div>';
+      });
+      html += '</div>';
+    });
+    html += '</div>';
+    el.innerHTML = html;
+    document.getElementById('calRange').textContent = days.length === 1
+      ? days[0].toLocaleDateString('es-ES', { dateStyle: 'full' })
+      : iso(days[0]) + ' → ' + iso(days[days.length - 1]);
+  }
+
+  function escapeHtml(s) {
+    var div = document.createElement('div');
+    div.textContent = s == null ? '' : s;
+    return div.innerHTML.replace(/"/g, '&quot;');
+  }
+
+  function load(force) {
+    var days = visibleDays();
+    var url = feedUrl + '?start=' + iso(days[0]) + '&end=' + iso(days[days.length - 1]);
+    var headers = {};
+    if (!force && etag) headers['If-None-Match'] = etag;
+    fetch(url, { headers: headers, credentials: 'same-origin', cache: 'no-store' })
+      .then(function(res) {
+        if (res.status === 304) return null;
+        etag = res.headers.get('ETag');
+        return res.json();
+      })
+      .then(function(data) {
+        if (data) render(data);
+      })
+      .catch(function() {});
+  }
+
+  function move(step) {
+    current = addDays(current, view === 'day' ? step : step * 7);
+    etag = null;
+    render(null);
+    load(true);
+  }
+
+  document.getElementById('calPrev').addEventListener('click', function() { move(-1); });
+  document.getElementById('calNext').addEventListener('click', function() { move(1); });
+  document.getElementById('calToday').addEventListener('click', function() { current = new Date(); move(0); });
+  document.getElementById('calView').addEventListener('change', function() { view = this.value; move(0); });
+
+  render(null);
+  load(true);
+  setInterval(function() { if (!document.hidden) load(false); }, POLL_MS);
+})();
@@ -0,0 +1,202 @@
+// Portada: formulario de reserva y slideshow del hero (antes en línea en home.html).
+// La URL de horas disponibles y la hora elegida llegan como data-* del formulario.
+
+// Si la URL contiene ?offering=ID o un anchor #reservas, enfocamos el formulario
+(function(){
+  const params = new URLSearchParams(window.location.search);
+  if(params.get('offering') || window.location.hash === '#reservas'){
+    const el = document.getElementById('reservas');
+    if(el) el.scrollIntoView({behavior:'smooth'});
+  }
+})();
+
+// When the user selects an offering and a date, reload the page with those
+// params so the server can compute available times and render them.
+(function(){
+  const form = document.querySelector('#reservas form[data-times-url]');
+  if(!form) return;
+  const timesUrl = form.dataset.timesUrl;
+  const selectedTime = form.dataset.selectedTime || '';
+  const dateEl = document.getElementById('id_date');
+  const offeringEl = document.getElementById('id_offering');
+  // small inline hint element to guide user when needed
+  function ensureHintContainer(){
+    let c = document.getElementById('time-hint');
+    if(!c){
+      c = document.createElement('div');
+      c.id = 'time-hint';
+      c.style.marginTop = '6px';
+      c.style.fontSize = '13px';
+      c.style.color = 'var(--muted)';
+      const parent = document.querySelector('#reservas .form .form-field:nth-child(3)') || document.querySelector('#reservas .form .form-field');
+      // append near time field
+      const timeField = document.getElementById('id_time');
+      if(timeField && timeField.parentNode){
+        timeField.parentNode.insertBefore(c, timeField.nextSibling);
+      } else if(parent){
+        parent.appendChild(c);
+      }
+    }
+    return c;
+  }
+
+  async function fetchAndPopulate(){
+    const d = dateEl ? dateEl.value : '';
+    const o = offeringEl ? offeringEl.value : '';
+    const hint = ensureHintContainer();
+    hint.textContent = '';
+    const timeSelect = document.getElementById('id_time');
+    if(!timeSelect) return;
+    // If user selected date but no offering, ask to choose offering
+    if(d && !o){
+      hint.textContent = 'Selecciona una oferta para calcular las horas disponibles.';
+      timeSelect.innerHTML = '<option value="">Selecciona una fecha y oferta</option>';
+      timeSelect.disabled = true;
+      return;
+    }
+    if(!d || !o){
+      // reset to disabled placeholder
+      timeSelect.innerHTML = '<option value="">Selecciona una fecha primero</option>';
+      timeSelect.disabled = true;
+      return;
+    }
+
+    // Fetch available times from API
+    try{
+      const q = new URLSearchParams({offering: o, date: d});
+      const res = await fetch(`${timesUrl}?${q.toString()}`);
+      if(!res.ok) throw new Error('network');
+      const data = await res.json();
+      const times = data.times || [];
+      if(times.length === 0){
+        hint.textContent = 'No hay horas disponibles para la fecha seleccionada.';
+        timeSelect.innerHTML = '<option value="">No hay horas disponibles</option>';
+        timeSelect.disabled = true;
+      } else {
+        let html = '<option value="">-- Elige una hora --</option>';
+        for(const t of times){
+          html += `<option value="${t}">${t}</option>`;
+        }
+        timeSelect.innerHTML = html;
+        timeSelect.disabled = false;
+        // preserve previous selection if present
+        try{
+          const prev = selectedTime;
+          if(prev){ timeSelect.value = prev; }
+        } catch(e){}
+      }
+    }catch(e){
+      hint.textContent = 'No se pudo calcular las horas disponibles. Intenta de nuevo.';
+      timeSelect.disabled = true;
+    }
+  }
+
+  if(dateEl) dateEl.addEventListener('change', fetchAndPopulate);
+  if(offeringEl) offeringEl.addEventListener('change', function(){ setTimeout(fetchAndPopulate, 10); });
+})();
+
+// Ensure the time select is disabled unless a date is chosen.
+(function(){
+  function toggleTime(){
+    const dateEl = document.getElementById('id_date');
+    const timeEl = document.getElementById('id_time');
+    if(!timeEl) return;
+    const hasDate = dateEl && dateEl.value;
+    // If hasDate truthy, enable only if there are real options
+    if(hasDate){
+      // enable if there is at least one non-empty option
+      const hasOption = Array.from(timeEl.options).some(opt => opt.value && !opt.disabled);
+      timeEl.disabled = !hasOption;
+    } else {
+      timeEl.disabled = true;
+    }
+  }
+  document.addEventListener('DOMContentLoaded', toggleTime);
+  document.addEventListener('change', function(e){
+    if(e.target && (e.target.id === 'id_date' || e.target.id === 'id_offering')){
+      // small timeout to allow server+reload flows; still safe for client-side changes
+      setTimeout(toggleTime, 10);
+    }
+  });
+})();
+
+// Desactivar fines de semana en el campo de fecha
+(function(){
+  const dateEl = document.getElementById('id_date');
+  if(!dateEl) return;
+
+  // Función para verificar si una fecha es fin de semana
+  function isWeekend(dateString){
+    const date = new Date(dateString + 'T00:00:00');
+    const day = date.getDay();
+    return day === 0 || day === 6; // 0=domingo, 6=sábado
+  }
+
+  // Validar al cambiar la fecha
+  dateEl.addEventListener('change', function(){
+    if(isWeekend(this.value)){
+      // Mostrar alerta y limpiar el valor
+      alert('No se pueden hacer reservas en fin de semana. Por favor, elige un día entre semana.');
+      this.value = '';
+    }
+  });
+})();
+
+// Slideshow con crossfade + efecto Ken Burns entre las capas del hero
+(function(){
+  const hero = document.querySelector('.hero.hero-cover');
+  const layers = hero ? hero.querySelectorAll('.hero-bg-layer') : [];
+  if(!hero || layers.length < 2) return;
+
+  let activeLayer = 0;
+
+  function whenLoaded(layer, callback){
+    const img = layer.querySelector('img');
+    if(!img || img.complete){ callback(); return; }
+    // No bloquear si falla
+    img.addEventListener('load', callback, {once: true});
+    img.addEventListener('error', callback, {once: true});
+  }
+
+  function next(){
+    const nextLayer = (activeLayer + 1) % layers.length;
+    whenLoaded(layers[nextLayer], function(){
+      // Crossfade + suave zoom
+      layers[activeLayer].classList.remove('is-active');
+      layers[nextLayer].classList.add('is-active');
+      activeLayer = nextLayer;
+    });
+  }
+
+  setInterval(next, 6000);
+})();
+
+// Si hay errores en el formulario, desplazarse a la sección de reservas
+(function(){
+  // Detectar si hay errores en el formulario
+  const hasErrors = document.querySelectorAll('.form-field').length > 0 && 
+                    (document.querySelectorAll('.form-field ul li').length > 0 || 
+                     document.querySelectorAll('[data-phone-error]').length > 0 ||
+                     document.querySelectorAll('.form-field input.error, .form-field select.error').length > 0);
+
+  const nonFieldErrors = document.querySelector('.form .alert');
+
+  if(hasErrors || nonFieldErrors){
+    // Esperar a que DOM esté listo y luego desplazarse
+    setTimeout(function(){
+      const reservasSection = document.getElementById('reservas');
+      if(reservasSection){
+        reservasSection.scrollIntoView({behavior: 'smooth', block: 'start'});
+      }
+    }, 100);
+  }
+})();
+
+// Aplicar clase 'error' al campo de teléfono si hay errores
+(function(){
+  const phoneField = document.getElementById('id_phone');
+  const phoneErrors = document.querySelectorAll('[data-phone-error]');
+  if(phoneField && phoneErrors.length > 0){
+    phoneField.classList.add('error');
+  }
+})();
@@ -0,0 +1,33 @@
+// Scripts comunes a las páginas públicas (antes en línea en cada plantilla).
+// Cada bloque comprueba que sus elementos existen: el bundle se carga en todas las páginas.
+
+// Año del pie de página
+(function(){
+  const year = document.getElementById('year');
+  if(year) year.textContent = new Date().getFullYear();
+})();
+
+// FAQ: al abrir una pregunta se cierran las demás
+document.querySelectorAll('.faq-item').forEach(item => {
+  item.addEventListener('toggle', function() {
+    if (this.open) {
+      // Si se abre esta caja, cerrar todas las demás
+      document.querySelectorAll('.faq-item').forEach(otherItem => {
+        if (otherItem !== this && otherItem.open) {
+          otherItem.open = false;
+        }
+      });
+    }
+  });
+});
+
+// Tienda: si el sitio externo bloquea el iframe, el navegador no lo pintará.
+// Mostramos un fallback si en unos segundos no se ha cargado nada.
+(function(){
+  const iframe = document.querySelector('.shop-iframe');
+  const fallback = document.getElementById('embed-fallback');
+  if(!iframe || !fallback) return;
+  let loaded = false;
+  iframe.addEventListener('load', () => { loaded = true; });
+  setTimeout(() => { if(!loaded) fallback.hidden = false; }, 2500);
+})();
@@ -0,0 +1,264 @@
+"""Mantenimiento y lectura de la tabla resumen `DailyStats`.
+
+El dashboard nunca agrega sobre la tabla de reservas: lee filas de
+`DailyStats` (una por día). Cada guardado/borrado de una reserva o alta de
+cliente recalcula sólo el día afectado (`refresh_days`); las altas sólo se
+recuentan cuando cambia un usuario. Cambiar el precio o la duración de una
+oferta recalcula todos los días con reservas suyas (`refresh_offering`), así
+que los ingresos reflejan siempre los precios actuales, no los del momento de
+la reserva. `rebuild_all` regenera la tabla completa desde cero. Todas suman
+las reservas vivas y las archivadas (`ReservationArchive`).
+"""
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from . import catalog
+from .catalog import DEFAULT_DURATION_MINUTES
+from .models import DailyStats, Reservation, ReservationArchive
+
+# Days recomputed per round of queries in refresh_days
+REFRESH_CHUNK_SIZE = 500
+# Horario de atención (9:00-18:00) expresado en minutos reservables por día laborable
+BUSINESS_MINUTES_PER_DAY = 9 * 60
+
+_batch = threading.local()
+
+
+@contextmanager
+def stats_batch():
+    """Defer DailyStats refreshes until the block exits, refreshing each day once.
+
+    Used by bulk operations so that touching 20 reservations of the same day
+    recomputes that day once instead of 20 times.
+    """
+    if getattr(_batch, 'dates', None) is not None:
+        # Nested batch: the outermost one flushes
+        yield
+        return
+    # {date: whether its new clients must be recounted}
+    _batch.dates = {}
+    try:
+        yield
+        dates = _batch.dates
+    finally:
+        _batch.dates = None
+    refresh_days(dates, client_dates=[d for d, clients in dates.items() if clients])
+
+
+def mark_dirty(*dates, clients=False):
+    """Refresh the given days now, or at the end of the current `stats_batch`.
+
+    `clients=True` when a user changed: the days' new clients are recounted too
+    (otherwise the stored count is kept).
+    """
+    dates = {d for d in dates if d is not None}
+    if not dates:
+        return
+    pending = getattr(_batch, 'dates', None)
+    if pending is not None:
+        for d in dates:
+            pending[d] = pending.get(d, False) or clients
+    else:
+        refresh_days(dates, client_dates=dates if clients else ())
+
+
+def _reservation_rows(**filters):
+    """Aggregate active (non-cancelled) reservations of the live and archive
+    tables grouped by (date, offering).
+    """
+    for model in (Reservation, ReservationArchive):
+        yield from (
+            model.objects.filter(**filters).active().order_by()
+            .values('date', 'offering_id', 'offering__duration_minutes', 'offering__price_eur')
+            .annotate(n=Count('id'))
+        )
+
+
+def _client_rows(queryset):
+    """Count non-staff users grouped by local join date."""
+    return (
+        queryset.filter(is_staff=False)
+        .annotate(day=TruncDate('date_joined', tzinfo=timezone.get_current_timezone()))
+        .order_by()
+        .values('day')
+        .annotate(n=Count('id'))
+    )
+
+
+def _accumulate(summary, row):
+    day = summary.setdefault(row['date'], _empty_day())
+    n = row['n']
+    minutes = row['offering__duration_minutes'] or DEFAULT_DURATION_MINUTES
+    price = row['offering__price_eur'] or Decimal('0')
+    day['reservations_count'] += n
+    day['booked_minutes'] += n * minutes
+    day['revenue_eur'] += n * price
+    if row['offering_id'] is not None:
+        key = str(row['offering_id'])
+        day['revenue_by_offering'][key] = Decimal(day['revenue_by_offering'].get(key, '0')) + n * price
+
+
+def _empty_day():
+    return {
+        'reservations_count': 0,
+        'booked_minutes': 0,
+        'revenue_eur': Decimal('0'),
+        'revenue_by_offering': {},
+        'new_clients': 0,
+    }
+
+
+def _finalize(values):
+    values['revenue_by_offering'] = {k: str(v) for k, v in values['revenue_by_offering'].items()}
+    return values
+
+
+def refresh_days(dates, client_dates=()):
+    """Recompute the DailyStats rows for the given dates (indexed queries only).
+
+    New clients are counted on the (unindexed) user table only for the days in
+    `client_dates`; the other days keep their stored count.
+    """
+    dates = sorted(set(dates))
+    client_dates = set(client_dates)
+    for i in range(0, len(dates), REFRESH_CHUNK_SIZE):
+        _refresh_chunk(dates[i:i + REFRESH_CHUNK_SIZE], client_dates)
+
+
+def _refresh_chunk(dates, client_dates):
+    summary = {d: _empty_day() for d in dates}
+    for row in _reservation_rows(date__in=dates):
+        _accumulate(summary, row)
+    stored = dict(DailyStats.objects.filter(date__in=dates).values_list('date', 'new_clients'))
+    recount = [d for d in dates if d in client_dates]
+    if recount:
+        # One grouped query for every recounted day of the chunk
+        users = get_user_model().objects.filter(date_joined__date__in=recount)
+        stored.update({d: 0 for d in recount})
+        stored.update((row['day'], row['n']) for row in _client_rows(users))
+    for d in dates:
+        summary[d]['new_clients'] = stored.get(d, 0)
+
+    with transaction.atomic():
+        for d, values in summary.items():
+            if not values['reservations_count'] and not values['new_clients']:
+                DailyStats.objects.filter(date=d).delete()
+            else:
+                DailyStats.objects.update_or_create(date=d, defaults=_finalize(values))
+
+
+def offering_dates(offering_id):
+    """Days with reservations (live or archived) of the offering `offering_id`."""
+    dates = set()
+    for model in (Reservation, ReservationArchive):
+        dates.update(model.objects.filter(offering_id=offering_id).order_by().values_list('date', flat=True).distinct())
+    return dates
+
+
+def refresh_offering(offering_id):
+    """The offering's price or duration changed: recompute every day that has reservations of it."""
+    mark_dirty(*offering_dates(offering_id))
+
+
+def rebuild_all():
+    """Regenerate the whole DailyStats table. Returns the number of days stored."""
+    summary = {}
+    for row in _reservation_rows():
+        _accumulate(summary, row)
+    for row in _client_rows(get_user_model().objects.all()):
+        summary.setdefault(row['day'], _empty_day())['new_clients'] = row['n']
+
+    with transaction.atomic():
+        DailyStats.objects.all().delete()
+        DailyStats.objects.bulk_create(
+            [DailyStats(date=d, **_finalize(values)) for d, values in sorted(summary.items())],
+            batch_size=500,
+        )
+    return len(summary)
+
+
+def dashboard_summary(today=None, weeks_back=3, weeks_ahead=2):
+    """Build the dashboard figures for a window of whole weeks around today.
+
+    Reads only DailyStats rows (one per day); offering names come from the catalog.
+    """
+    today = today or timezone.localdate()
+    start = today - timedelta(days=today.weekday(), weeks=weeks_back)
+    end = start + timedelta(weeks=weeks_back + weeks_ahead + 1) - timedelta(days=1)
+    rows = {s.date: s for s in DailyStats.objects.filter(date__range=(start, end))}
+
+    days = []
+    weeks = OrderedDict()
+    revenue_by_offering = {}
+    booked_minutes = 0
+    capacity_minutes = 0
+    d = start
+    while d <= end:
+        s = rows.get(d)
+        is_workday = d.weekday() < 5
+        day = {
+            'date': d,
+            'reservations': s.reservations_count if s else 0,
+            'revenue': s.revenue_eur if s else Decimal('0'),
+            'new_clients': s.new_clients if s else 0,
+            'occupancy': 0,
+        }
+        if is_workday:
+            capacity_minutes += BUSINESS_MINUTES_PER_DAY
+            if s:
+                booked_minutes += s.booked_minutes
+                day['occupancy'] = round(100 * s.booked_minutes / BUSINESS_MINUTES_PER_DAY)
+        if s:
+            for key, amount in s.revenue_by_offering.items():
+                revenue_by_offering[key] = revenue_by_offering.get(key, Decimal('0')) + Decimal(amount)
+        days.append(day)
+
+        week_start = d - timedelta(days=d.weekday())
+        week = weeks.setdefault(week_start, {'start': week_start, 'reservations': 0, 'revenue': Decimal('0'), 'new_clients': 0})
+        week['reservations'] += day['reservations']
+        week['revenue'] += day['revenue']
+        week['new_clients'] += day['new_clients']
+        d += timedelta(days=1)
+
+    offerings = sorted(
+        ({'name': getattr(catalog.get(int(k)), 'name', f'Oferta #{k}'), 'revenue': v} for k, v in revenue_by_offering.items()),
+        key=lambda o: o['revenue'],
+        reverse=True,
+    )
+    max_day = max((day['reservations'] for day in days), default=0) or 1
+    for day in days:
+        day['bar'] = round(100 * day['reservations'] / max_day)
+
+    return {
+        'start': start,
+        'end': end,
+        'days': days,
+        'weeks': list(weeks.values()),
+        'revenue_by_offering': offerings,
+        'revenue_total': sum((o['revenue'] for o in offerings), Decimal('0')),
+        'occupancy_rate': round(100 * booked_minutes / capacity_minutes) if capacity_minutes else 0,
+        'new_clients': sum(day['new_clients'] for day in days),
+    }
+
+
+def totals():
+    """All-time totals summed over the (small) summary table."""
+    agg = DailyStats.objects.aggregate(
+        reservations=Sum('reservations_count'),
+        clients=Sum('new_clients'),
+        revenue=Sum('revenue_eur'),
+    )
+    return {
+        'reservations': agg['reservations'] or 0,
+        'clients': agg['clients'] or 0,
+        'revenue': agg['revenue'] or Decimal('0'),
+    }
@@ -0,0 +1,40 @@
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+from reservas import assets
+
+register = template.Library()
+
+
+def _paths(name):
+    if not settings.DEBUG and assets.is_built(name):
+        return [assets.bundle_path(name)]
+    return list(assets.BUNDLES[name])
+
+
+@register.simple_tag
+def bundle(name, critical=False):
+    """`<link>`/`<script>` for a bundle of reservas.assets.BUNDLES.
+
+        {% bundle 'site.css' %}
+        {% bundle 'site.css' critical=True %}   {# home: inline critical CSS, rest non-blocking #}
+
+    With DEBUG=False and the bundle built it points to the minified file;
+    otherwise to each source file, so edits show up without rebuilding.
+    """
+    paths = _paths(name)
+    if name.endswith('.js'):
+        return format_html_join('\n', '<script src="{}"></script>', ((static(p),) for p in paths))
+    links = format_html_join('\n', '<link rel="stylesheet" href="{}">', ((static(p),) for p in paths))
+    css = assets.load_critical_css() if critical and not settings.DEBUG else ''
+    if not css:
+        return links
+    preloads = format_html_join(
+        '\n', '<link rel="preload" href="{}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">',
+        ((static(p),) for p in paths),
+    )
+    # Built from our own style.css by `build_assets`
+    return format_html('<style>{}</style>\n{}\n<noscript>{}</noscript>', mark_safe(css), preloads, links)
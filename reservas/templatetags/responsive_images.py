@@ -0,0 +1,50 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+
+from reservas.images import load_manifest
+
+register = template.Library()
+
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+
+def _srcset(variants):
+    return ', '.join(f"{static(v['path'])} {v['width']}w" for v in variants)
+
+
+@register.simple_tag
+def responsive_image(path, alt='', sizes='100vw', loading='lazy', css_class='', fetchpriority=''):
+    """`<picture>` with AVIF/WebP `srcset` sources (see reservas.images) and the
+    original file as fallback, with width/height so the layout doesn't shift.
+
+        {% responsive_image 'reservas/img/1.png' alt='' sizes='100vw' loading='eager' %}
+
+    Without generated variants it renders a plain `<img>`.
+    """
+    entry = load_manifest().get(path)
+    attrs = {
+        'src': static(path),
+        'alt': alt,
+        'loading': loading,
+        'decoding': 'async',
+        'class': css_class or None,
+        'fetchpriority': fetchpriority or None,
+    }
+    if entry is None:
+        return format_html('<img{}>', _attrs(attrs))
+    attrs.update(width=entry['width'], height=entry['height'])
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        ((MIME_TYPES[fmt], _srcset(variants), sizes) for fmt, variants in _ordered(entry['variants'])),
+    )
+    return format_html('<picture>{}<img{}></picture>', sources, _attrs(attrs))
+
+
+def _ordered(variants):
+    return sorted(variants.items(), key=lambda item: list(MIME_TYPES).index(item[0]))
+
+
+def _attrs(attrs):
+    # alt="" is kept: it marks the image as decorative
+    return format_html_join('', ' {}="{}"', ((k, v) for k, v in attrs.items() if v is not None))
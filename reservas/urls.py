@@ -5,6 +5,7 @@ urlpatterns = [
     path('', views.home, name='home'),
     path('reservar/', views.reservar, name='reservar'),
     path('reserva-exito/', views.reserva_exito, name='reserva_exito'),
+    path('mis-reservas/', views.my_reservations, name='my_reservations'),
     path('tienda/', views.tienda, name='tienda'),
     path('estudio-corporal/', views.estudio_corporal, name='estudio_corporal'),
     path('contacto/', views.contacto, name='contacto'),
@@ -14,13 +15,22 @@ urlpatterns = [
     path('api/available-times/', views.available_times_api, name='available_times_api'),
     # Auth
     path('accounts/signup/', views.signup_view, name='signup'),
+    path('accounts/verificar-email/', views.request_email_verification, name='request_email_verification'),
+    path('accounts/verificar-email/<str:token>/', views.verify_email_view, name='verify_email'),
     path('accounts/login/', views.CustomLoginView.as_view(), name='login'),
     path('accounts/logout/', views.logout_view, name='logout'),
     # Admin panel (personalized admin, not Django admin)
     path('panel/dashboard/', views.admin_dashboard, name='admin_dashboard'),
     path('panel/reservas/', views.admin_reservations, name='admin_reservations'),
     path('panel/clientes/', views.admin_clients, name='admin_clients'),
+    path('panel/calendario/', views.admin_calendar, name='admin_calendar'),
+    path('panel/api/reservas/', views.reservations_feed, name='reservations_feed'),
+    path('panel/api/reservas/eventos/', views.reservation_events, name='reservation_events'),
+    # CSV exports (streamed)
+    path('panel/reservas/exportar/', views.export_reservations, name='export_reservations'),
+    path('panel/clientes/exportar/', views.export_clients, name='export_clients'),
     # Admin actions (delete/cancel)
     path('panel/reservas/<int:reservation_id>/eliminar/', views.delete_reservation, name='delete_reservation'),
+    path('panel/reservas/acciones/', views.bulk_reservations, name='bulk_reservations'),
     path('panel/clientes/<int:user_id>/eliminar/', views.delete_user, name='delete_user'),
 ]
@@ -1,26 +1,40 @@
 from django.shortcuts import render, redirect
 from django.urls import reverse
-from .forms import ReservationForm
+from .forms import ReservationForm, SignUpForm
 from django.conf import settings
 import os
 import urllib.request
 import urllib.error
+import csv
+import hashlib
 import json
 import xml.etree.ElementTree as ET
 from datetime import datetime, date as ddate, time as dtime, timedelta
+from decimal import Decimal
+from urllib.parse import urlencode
+from django.db import transaction
+from django.db.models import Count, DateField, DecimalField, ExpressionWrapper, F, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Lower, Trim
 from .models import Reservation as ReservationModel
-from django.http import JsonResponse
+from .search import search_reservations, search_users
+from . import catalog, changes, events
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from natursur.caching import cache_anonymous_page, page_generation
+from natursur.database import readonly_view
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotModified, JsonResponse, QueryDict, StreamingHttpResponse
+from django.utils import timezone
 
 # Authentication imports
 from django.contrib.auth import login
 from django.contrib import messages
 from django.contrib.auth import logout
-from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.decorators import user_passes_test, login_required
 from django.contrib.auth.views import LoginView, LogoutView
 from django.contrib.auth import get_user_model
 from django.http import HttpResponseRedirect
 from django.core.mail import send_mail
+from django.core.paginator import Paginator
 import logging
 
 logger = logging.getLogger(__name__)
@@ -84,6 +98,33 @@ def _fetch_instagram_posts(username: str, limit: int = 6):
     return []
 
 
+# The home fragments are keyed on the catalog version and the deploy generation,
+# so they never go stale; the timeout only bounds how long unused keys linger.
+HOME_FRAGMENT_SECONDS = 24 * 3600
+
+
+def _home_fragments():
+    """Context shared by every render of home.html: the offerings and the key
+    of the cached hero/services and price-card fragments.
+    """
+    version = catalog.version()
+    return {
+        'offerings': catalog.offerings(),
+        'home_fragment_version': f'{version}.{page_generation()}' if version else '',
+        # Inside a transaction the catalog has no version: render without caching
+        'home_fragment_seconds': HOME_FRAGMENT_SECONDS if version else 0,
+    }
+
+
+def _busy_intervals(reservations):
+    """(start, end) naive datetimes of `reservations`, computed once for every slot checked."""
+    intervals = []
+    for r in reservations:
+        r_start = datetime.combine(r.date, r.time)
+        intervals.append((r_start, r_start + timedelta(minutes=catalog.duration_minutes(r.offering_id))))
+    return intervals
+
+
 def home(request):
     # If an offering id is provided in GET, preselect it in the form
     offering_prefill = request.GET.get('offering')
@@ -112,9 +153,6 @@ def home(request):
 
     youtube_videos = _fetch_youtube_videos(youtube_channel_id, limit=6)
     instagram_posts = _fetch_instagram_posts(instagram_username, limit=6)
-    from .models import Offering
-    offerings = Offering.objects.all().order_by('duration_minutes')
-
     # Compute available times when offering and date are provided as GET params
     available_times = None
     offering_id = request.GET.get('offering')
@@ -134,7 +172,9 @@ def home(request):
         all_slots = []
     if offering_id and date_str:
         try:
-            offering_obj = Offering.objects.get(pk=offering_id)
+            offering_obj = catalog.get(int(offering_id))
+            if offering_obj is None:
+                raise ValueError(f'Oferta desconocida: {offering_id}')
             # parse date yyyy-mm-dd
             req_date = datetime.strptime(date_str, '%Y-%m-%d').date()
             business_start = dtime(9, 0)
@@ -147,18 +187,12 @@ def home(request):
             last_start_dt = datetime.combine(req_date, business_end) - duration
 
             # reservations on that date
-            qs = ReservationModel.objects.filter(date=req_date)
+            busy = _busy_intervals(ReservationModel.objects.active().filter(date=req_date))
 
             while current_dt <= last_start_dt:
                 slot_end = current_dt + duration
-                overlaps = False
-                for r in qs:
-                    r_start = datetime.combine(r.date, r.time)
-                    r_end = r_start + timedelta(minutes=(r.offering.duration_minutes if r.offering else 60))
-                    # overlap if start < r_end and r_start < end
-                    if (current_dt < r_end) and (r_start < slot_end):
-                        overlaps = True
-                        break
+                # overlap if start < r_end and r_start < end
+                overlaps = any(current_dt < r_end and r_start < slot_end for r_start, r_end in busy)
                 if not overlaps and current_dt >= datetime.combine(ddate.today(), dtime(0, 0)):
                     slots.append(current_dt.time().strftime('%H:%M'))
                 current_dt = current_dt + step
@@ -168,8 +202,8 @@ def home(request):
             available_times = None
 
     return render(request, 'reservas/home.html', {
+        **_home_fragments(),
         'form': form,
-        'offerings': offerings,
         'youtube_videos': youtube_videos,
         'instagram_posts': instagram_posts,
         'facebook_page_url': 'https://www.facebook.com/natursur',
@@ -191,29 +225,68 @@ def reservar(request):
 
     form = ReservationForm(request.POST)
     if form.is_valid():
-        reservation = form.save()
+        reservation = form.save(commit=False)
+        if request.user.is_authenticated:
+            reservation.user = request.user
+        reservation.save()
         # Send confirmation email
         _send_confirmation_email(reservation)
         return redirect('reserva_exito')
 
-    return render(request, 'reservas/home.html', {'form': form})
+    return render(request, 'reservas/home.html', {**_home_fragments(), 'form': form})
+
+
+MY_RESERVATIONS_PER_PAGE = 10
 
 
+@login_required
+def my_reservations(request):
+    """Upcoming and past bookings of the logged-in client, each list paginated.
+    The history also includes the archived ones (ReservationArchive); every
+    list is served by a (user, date) index.
+    """
+    from .models import Reservation, ReservationArchive
+    today = ddate.today()
+    mine = Reservation.objects.filter(user=request.user).select_related('offering')
+    upcoming = Paginator(mine.filter(date__gte=today).order_by('date', 'time'), MY_RESERVATIONS_PER_PAGE)
+    # One UNION ALL query per page: live and archived ids never overlap
+    fields = ('id', 'date', 'time', 'offering_id', 'service', 'status')
+    history = (
+        Reservation.objects.filter(user=request.user, date__lt=today).order_by().values(*fields)
+        .union(ReservationArchive.objects.filter(user=request.user).order_by().values(*fields), all=True)
+        .order_by('-date', '-time')
+    )
+    past = Paginator(history, MY_RESERVATIONS_PER_PAGE).get_page(request.GET.get('pasadas'))
+    past.object_list = [Reservation(**row) for row in past.object_list]
+    # Offerings from the in-process catalog instead of a join
+    offerings = {o.pk: o for o in catalog.offerings()}
+    for r in past.object_list:
+        r.offering = offerings.get(r.offering_id)
+    return render(request, 'reservas/my_reservations.html', {
+        'upcoming': upcoming.get_page(request.GET.get('proximas')),
+        'past': past,
+    })
+
+
+@cache_anonymous_page
 def reserva_exito(request):
     return render(request, 'reservas/booking_success.html')
 
 
+@cache_anonymous_page
 def estudio_corporal(request):
     """Render simple informational page 'Estudio corporal'."""
     return render(request, 'reservas/estudio_corporal.html')
 
 
+@cache_anonymous_page
 def unete_al_equipo(request):
     """Render 'Únete al equipo' informational page (reused hero from attachment).
     This page is internal and can be expanded later with contact form or application flow.
     """
     return render(request, 'reservas/unete_al_equipo.html')
 
+@readonly_view
 def available_times_api(request):
     """Return JSON list of available time strings (HH:MM) for a given offering and date.
     GET params: offering (id), date (YYYY-MM-DD)
@@ -223,8 +296,9 @@ def available_times_api(request):
     if not offering_id or not date_str:
         return JsonResponse({'times': []})
     try:
-        from .models import Offering
-        offering_obj = Offering.objects.get(pk=offering_id)
+        offering_obj = catalog.get(int(offering_id))
+        if offering_obj is None:
+            return JsonResponse({'times': []})
         req_date = datetime.strptime(date_str, '%Y-%m-%d').date()
         business_start = dtime(9, 0)
         business_end = dtime(18, 0)
@@ -235,17 +309,11 @@ def available_times_api(request):
         current_dt = datetime.combine(req_date, business_start)
         last_start_dt = datetime.combine(req_date, business_end) - duration
 
-        qs = ReservationModel.objects.filter(date=req_date)
+        busy = _busy_intervals(ReservationModel.objects.active().filter(date=req_date))
 
         while current_dt <= last_start_dt:
             slot_end = current_dt + duration
-            overlaps = False
-            for r in qs:
-                r_start = datetime.combine(r.date, r.time)
-                r_end = r_start + timedelta(minutes=(r.offering.duration_minutes if r.offering else 60))
-                if (current_dt < r_end) and (r_start < slot_end):
-                    overlaps = True
-                    break
+            overlaps = any(current_dt < r_end and r_start < slot_end for r_start, r_end in busy)
             if not overlaps and current_dt >= datetime.combine(ddate.today(), dtime(0, 0)):
                 slots.append(current_dt.time().strftime('%H:%M'))
             current_dt = current_dt + step
@@ -262,45 +330,338 @@ def tienda(request):
 
 def signup_view(request):
     if request.method == 'POST':
-        form = UserCreationForm(request.POST)
+        form = SignUpForm(request.POST)
         if form.is_valid():
-            user = form.save()
+            with transaction.atomic():
+                user = form.save()
+                # Guest bookings with this email are linked once the address is verified
+                _enqueue_verification_email(request, user)
             # By default new users are not staff
             login(request, user)
-            messages.success(request, 'Cuenta creada. Bienvenido, ahora puedes reservar.')
+            messages.success(
+                request,
+                'Cuenta creada. Bienvenido, ahora puedes reservar. Te hemos enviado un email '
+                'para confirmar tu dirección y ver en «Mis reservas» las citas que hiciste sin cuenta.',
+            )
             return redirect('home')
     else:
-        form = UserCreationForm()
+        form = SignUpForm()
     return render(request, 'reservas/signup.html', {'form': form})
 
 
+def _enqueue_verification_email(request, user):
+    from . import accounts, notifications
+    url = request.build_absolute_uri(reverse('verify_email', args=[accounts.email_verification_token(user)]))
+    notifications.enqueue([notifications.verification_email(user, url)])
+
+
+@login_required
+def request_email_verification(request):
+    """Send a new verification link, e.g. for accounts created before signup sent one."""
+    if request.method != 'POST':
+        return redirect('my_reservations')
+    if not request.user.email:
+        messages.error(request, 'Tu cuenta no tiene email.')
+        return redirect('my_reservations')
+    _enqueue_verification_email(request, request.user)
+    messages.success(request, f'Te hemos enviado un enlace de verificación a {request.user.email}.')
+    return redirect('my_reservations')
+
+
+def verify_email_view(request, token):
+    """Link from the verification email: links the guest bookings made with that address."""
+    from . import accounts
+    user = accounts.verify_email(token)
+    if user is None:
+        messages.error(request, 'El enlace de verificación no es válido o ha caducado.')
+        return redirect('home')
+    linked = accounts.link_user(user)
+    messages.success(request, f'Email confirmado. {linked} reservas anteriores vinculadas a tu cuenta.')
+    return redirect('my_reservations')
+
+
+def _filter_reservations(request, qs):
+    """Apply the reservation list filters from GET params.
+    GET params: date_from, date_to (YYYY-MM-DD), offering (id), q (name/email/phone)
+    Returns the filtered queryset and the dict of filters actually applied.
+    Shared by the staff list and the export so both always show the same rows.
+    """
+    filters = {}
+    for param, lookup in (('date_from', 'date__gte'), ('date_to', 'date__lte')):
+        value = request.GET.get(param, '').strip()
+        if not value:
+            continue
+        try:
+            qs = qs.filter(**{lookup: datetime.strptime(value, '%Y-%m-%d').date()})
+            filters[param] = value
+        except ValueError:
+            pass
+    offering_id = request.GET.get('offering', '').strip()
+    if offering_id.isdigit():
+        qs = qs.filter(offering_id=int(offering_id))
+        filters['offering'] = offering_id
+    term = request.GET.get('q', '').strip()
+    if term:
+        qs = search_reservations(qs, term)
+        filters['q'] = term
+    return qs, filters
+
+
 @user_passes_test(lambda u: u.is_staff)
 def admin_reservations(request):
-    # View that shows all reservations to staff users
+    # View that shows all reservations to staff users. Read from the primary, not
+    # the replica: the live updates resume from events_cursor, which must be the
+    # change-log end of the very data the list shows
     from .models import Reservation
     qs = Reservation.objects.select_related('offering').order_by('-date', '-time')
-    return render(request, 'reservas/admin_reservations.html', {'reservations': qs})
+    qs, filters = _filter_reservations(request, qs)
+    return render(request, 'reservas/admin_reservations.html', {
+        'reservations': qs,
+        'filters': filters,
+        'offerings': catalog.offerings(),
+        'export_query': urlencode(filters),
+        'events_cursor': changes.latest_id(),
+    })
+
+
+async def reservation_events(request):
+    """Server-sent events with new, changed, cancelled and deleted reservations (admin only).
+    The client resumes from Last-Event-ID (or ?cursor=), the id of the last
+    change-log entry it has seen. Under ASGI the stream stays open and every
+    connection shares one poller (see events.py); under WSGI it sends what is
+    pending and closes, and EventSource reconnects after `retry`.
+    """
+    is_staff = await sync_to_async(lambda: request.user.is_authenticated and request.user.is_staff)()
+    if not is_staff:
+        return HttpResponseForbidden()
+    raw_cursor = request.headers.get('Last-Event-ID') or request.GET.get('cursor', '')
+    cursor = int(raw_cursor) if raw_cursor.isdigit() else None
+    if isinstance(request, ASGIRequest):
+        response = StreamingHttpResponse(events.stream_changes(cursor), content_type='text/event-stream')
+    else:
+        body = await sync_to_async(events.pending_changes)(cursor)
+        response = HttpResponse(body, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Tell nginx not to buffer the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _clients_with_stats():
+    """Non-staff users annotated with booking stats in a single query.
+    Reservations are matched on the normalized (lower-case, indexed) email:
+    bookings_count, last_visit (latest date up to today) and total_spent,
+    counting archived reservations too.
+    """
+    from .models import Reservation, ReservationArchive
+    User = get_user_model()
+    money = DecimalField(max_digits=10, decimal_places=2)
+
+    def per_client(model):
+        bookings = model.objects.active().filter(email=OuterRef('email_key')).order_by().values('email')
+        return {
+            'count': Coalesce(Subquery(bookings.annotate(n=Count('id')).values('n')), 0),
+            'last': Subquery(bookings.filter(date__lte=timezone.localdate()).annotate(last=Max('date')).values('last')),
+            'spent': Coalesce(
+                Subquery(bookings.annotate(total=Sum('offering__price_eur')).values('total')),
+                Value(Decimal('0')),
+                output_field=money,
+            ),
+        }
+
+    live, archived = per_client(Reservation), per_client(ReservationArchive)
+    return (
+        User.objects.filter(is_staff=False)
+        .annotate(email_key=Lower(Trim('email')))
+        .annotate(
+            bookings_count=live['count'] + archived['count'],
+            # Archived reservations are always older than live ones
+            last_visit=Coalesce(live['last'], archived['last']),
+            total_spent=ExpressionWrapper(live['spent'] + archived['spent'], output_field=money),
+        )
+        .order_by('-date_joined')
+    )
 
 
 @user_passes_test(lambda u: u.is_staff)
+@readonly_view
 def admin_clients(request):
-    # View that shows all registered users (clients)
-    User = get_user_model()
-    # Get all non-staff users (regular clients), ordered by date joined
-    clients = User.objects.filter(is_staff=False).order_by('-date_joined')
-    return render(request, 'reservas/admin_clients.html', {'clients': clients})
+    # View that shows all registered users (clients) with their booking stats
+    clients = _clients_with_stats()
+    term = request.GET.get('q', '').strip()
+    if term:
+        clients = search_users(clients, term)
+    return render(request, 'reservas/admin_clients.html', {'clients': clients, 'q': term})
+
+
+# Longest date range the calendar feed will return in one call (a bit over a month)
+CALENDAR_MAX_DAYS = 42
 
 
 @user_passes_test(lambda u: u.is_staff)
-def admin_dashboard(request):
-    # Admin dashboard with overview
+def admin_calendar(request):
+    # Week/day calendar grid for staff; rows are loaded from reservations_feed
+    return render(request, 'reservas/admin_calendar.html', {
+        'business_start': 9,
+        'business_end': 18,
+    })
+
+
+@user_passes_test(lambda u: u.is_staff)
+@readonly_view
+def reservations_feed(request):
+    """Return JSON with the reservations between two dates for the staff calendar.
+    GET params: start, end (YYYY-MM-DD, inclusive; at most CALENDAR_MAX_DAYS apart)
+    One indexed date-range query fetching only the needed columns. The response
+    carries an ETag so polling clients get a 304 when nothing changed.
+    """
     from .models import Reservation
-    User = get_user_model()
-    reservations_count = Reservation.objects.count()
-    clients_count = User.objects.filter(is_staff=False).count()
+    try:
+        start = datetime.strptime(request.GET.get('start', ''), '%Y-%m-%d').date()
+        end = datetime.strptime(request.GET.get('end', ''), '%Y-%m-%d').date()
+    except ValueError:
+        return JsonResponse({'error': 'Parámetros start y end (YYYY-MM-DD) obligatorios.'}, status=400)
+    if end < start or (end - start).days >= CALENDAR_MAX_DAYS:
+        return JsonResponse({'error': f'El rango debe ser de 1 a {CALENDAR_MAX_DAYS} días.'}, status=400)
+
+    rows = (
+        Reservation.objects.filter(date__range=(start, end))
+        .order_by('date', 'time')
+        .values('id', 'name', 'phone', 'date', 'time', 'status', 'offering__name', 'offering__duration_minutes')
+    )
+    events = [
+        {
+            'id': r['id'],
+            'name': r['name'],
+            'phone': r['phone'],
+            'date': r['date'].isoformat(),
+            'time': r['time'].strftime('%H:%M'),
+            'duration': r['offering__duration_minutes'] or 60,
+            'offering': r['offering__name'] or '',
+            'status': r['status'],
+        }
+        for r in rows
+    ]
+    body = json.dumps({'start': start.isoformat(), 'end': end.isoformat(), 'reservations': events})
+    etag = '"%s"' % hashlib.md5(body.encode('utf-8'), usedforsecurity=False).hexdigest()
+    if etag in [t.strip() for t in request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    # Always revalidate: the calendar polls this feed
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+# Rows are pulled from the database in chunks of this size while streaming,
+# so an export never holds more than one chunk in memory. On PostgreSQL
+# .iterator() reads through a server-side cursor (see DB_DISABLE_SERVER_SIDE_CURSORS).
+EXPORT_CHUNK_SIZE = 500
+
+
+# Spreadsheets run cells starting with these as formulas (CSV injection)
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_cell(value):
+    """`value` with a leading "'" if a spreadsheet would take it for a formula."""
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class _Echo:
+    """File-like object whose write() just returns the value (for csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def _stream_csv(header, rows, filename):
+    """Build a StreamingHttpResponse that writes `header` and then `rows` as CSV.
+    A UTF-8 BOM and ';' separator are used so Excel (es-ES) opens it directly.
+    Text cells are escaped with `_csv_cell`: names, notes, etc. come from visitors.
+    """
+    writer = csv.writer(_Echo(), delimiter=';')
+
+    def generate():
+        yield '\ufeff' + writer.writerow(header)
+        for row in rows:
+            yield writer.writerow([_csv_cell(value) for value in row])
+
+    response = StreamingHttpResponse(generate(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@user_passes_test(lambda u: u.is_staff)
+@readonly_view
+def export_reservations(request):
+    """Stream reservations as CSV, honoring the same filters as admin_reservations."""
+    from .models import Reservation
+    qs = Reservation.objects.select_related('offering').order_by('-date', '-time')
+    qs, _ = _filter_reservations(request, qs)
+    # Rows are read after the view returns: pin the database chosen by the router now
+    qs = qs.using(qs.db)
+
+    def rows():
+        for r in qs.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield [
+                r.date.isoformat(),
+                r.time.strftime('%H:%M'),
+                r.name,
+                r.email,
+                r.phone,
+                r.offering.name if r.offering else '',
+                r.offering.price_eur if r.offering else '',
+                r.get_service_display() if r.service else '',
+                r.get_status_display(),
+                r.notes,
+                timezone.localtime(r.created_at).strftime('%d/%m/%Y %H:%M'),
+            ]
+
+    header = ['Fecha', 'Hora', 'Cliente', 'Email', 'Teléfono', 'Oferta', 'Precio (€)', 'Servicio', 'Estado', 'Notas', 'Creada']
+    return _stream_csv(header, rows(), f'reservas-{ddate.today().isoformat()}.csv')
+
+
+@user_passes_test(lambda u: u.is_staff)
+@readonly_view
+def export_clients(request):
+    """Stream registered clients (non-staff users) and their booking stats as CSV."""
+    qs = search_users(_clients_with_stats(), request.GET.get('q', ''))
+    qs = qs.using(qs.db)
+
+    def rows():
+        for u in qs.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield [
+                u.username,
+                u.email,
+                u.get_full_name(),
+                timezone.localtime(u.date_joined).strftime('%d/%m/%Y %H:%M'),
+                timezone.localtime(u.last_login).strftime('%d/%m/%Y %H:%M') if u.last_login else '',
+                u.bookings_count,
+                u.last_visit.isoformat() if u.last_visit else '',
+                u.total_spent,
+            ]
+
+    header = ['Usuario', 'Email', 'Nombre completo', 'Fecha de registro', 'Última conexión',
+              'Reservas', 'Última visita', 'Gasto total (€)']
+    return _stream_csv(header, rows(), f'clientes-{ddate.today().isoformat()}.csv')
+
+
+@user_passes_test(lambda u: u.is_staff)
+@readonly_view
+def admin_dashboard(request):
+    # Admin dashboard with overview, read from the DailyStats summary table
+    # (never aggregates over the reservations table itself)
+    from . import stats
+    all_time = stats.totals()
     context = {
-        'reservations_count': reservations_count,
-        'clients_count': clients_count,
+        'reservations_count': all_time['reservations'],
+        'clients_count': all_time['clients'],
+        'revenue_all_time': all_time['revenue'],
+        'summary': stats.dashboard_summary(),
     }
     return render(request, 'reservas/admin_dashboard.html', context)
 
@@ -312,18 +673,19 @@ def _send_confirmation_email(reservation):
             logger.warning('Reservation %s has no email address', reservation.id)
             return
         
-        # Build email content
-        subject = f"Confirmación de reserva - {reservation.offering.name if reservation.offering else 'Natursur'}"
+        # Build email content (offering details from the in-process catalog)
+        offering = catalog.get(reservation.offering_id)
+        subject = f"Confirmación de reserva - {offering.name if offering else 'Natursur'}"
         date_str = reservation.date.strftime('%d/%m/%Y') if reservation.date else ''
         time_str = reservation.time.strftime('%H:%M') if reservation.time else ''
-        duration = f"{reservation.offering.duration_minutes} minutos" if reservation.offering and reservation.offering.duration_minutes else ''
-        price = f"€{reservation.offering.price_eur}" if reservation.offering and hasattr(reservation.offering, 'price_eur') else ''
+        duration = f"{offering.duration_minutes} minutos" if offering and offering.duration_minutes else ''
+        price = f"€{offering.price_eur}" if offering else ''
         
         # Plain text version
         text_message = (
             f"Hola {reservation.name},\n\n"
             f"¡Gracias por reservar con Natursur! Aquí tienes los detalles de tu cita:\n\n"
-            f"Servicio: {reservation.offering.name if reservation.offering else 'No especificado'}\n"
+            f"Servicio: {offering.name if offering else 'No especificado'}\n"
             f"Fecha: {date_str}\n"
             f"Hora: {time_str}\n"
             f"Duración: {duration}\n"
@@ -372,7 +734,7 @@ def _send_confirmation_email(reservation):
                     <div class="details">
                         <div class="detail-row">
                             <span class="detail-label">📋 Servicio:</span>
-                            <span class="detail-value">{reservation.offering.name if reservation.offering else 'No especificado'}</span>
+                            <span class="detail-value">{offering.name if offering else 'No especificado'}</span>
                         </div>
                         <div class="detail-row">
                             <span class="detail-label">📅 Fecha:</span>
@@ -471,6 +833,137 @@ def delete_reservation(request, reservation_id):
     return render(request, 'reservas/confirm_delete_reservation.html', {'reservation': reservation})
 
 
+def _find_conflicts(moved, days):
+    """Return moved reservations that would overlap an existing active one after shifting `days`.
+    `moved` are value dicts with id, date, time and offering__duration_minutes.
+    """
+    from .models import Reservation
+    if not moved:
+        return []
+    moved_ids = [r['id'] for r in moved]
+    target_dates = {r['date'] + timedelta(days=days) for r in moved}
+    existing = (
+        Reservation.objects.active()
+        .filter(date__in=target_dates)
+        .exclude(id__in=moved_ids)
+        .values('date', 'time', 'offering__duration_minutes')
+    )
+    by_date = {}
+    for r in existing:
+        start = datetime.combine(r['date'], r['time'])
+        by_date.setdefault(r['date'], []).append(
+            (start, start + timedelta(minutes=(r['offering__duration_minutes'] or 60)))
+        )
+    conflicts = []
+    for r in moved:
+        new_date = r['date'] + timedelta(days=days)
+        start = datetime.combine(new_date, r['time'])
+        end = start + timedelta(minutes=(r['offering__duration_minutes'] or 60))
+        if any(start < o_end and o_start < end for o_start, o_end in by_date.get(new_date, [])):
+            conflicts.append(r)
+    return conflicts
+
+
+@user_passes_test(lambda u: u.is_staff)
+def bulk_reservations(request):
+    """Apply one action to several reservations at once (admin only).
+    POST params: ids (repeated), action (cancel|reschedule|delete), days (offset for reschedule),
+    notify (queue emails to the clients), filters (list query string to return to)
+    Each action runs as a single UPDATE/DELETE inside a transaction, and the
+    notification emails are queued in bulk instead of being sent inline.
+    Deleting notifies (as a cancellation) only the bookings that still held an
+    upcoming slot.
+    """
+    from .models import Reservation, ReservationChange
+    from . import notifications, search, stats
+
+    back = QueryDict(request.POST.get('filters', ''))
+    back_query = urlencode({k: back[k] for k in ('date_from', 'date_to', 'offering', 'q') if back.get(k)})
+    back_url = reverse('admin_reservations') + (f'?{back_query}' if back_query else '')
+    if request.method != 'POST':
+        return redirect(back_url)
+
+    ids = [int(i) for i in request.POST.getlist('ids') if i.isdigit()]
+    action = request.POST.get('action')
+    notify = bool(request.POST.get('notify'))
+    if not ids:
+        messages.error(request, 'No has seleccionado ninguna reserva.')
+        return redirect(back_url)
+
+    selected = Reservation.objects.filter(id__in=ids)
+
+    if action == 'cancel':
+        targets = selected.active()
+        with transaction.atomic():
+            rows = list(targets.select_for_update().values('id', 'name', 'email', 'date', 'time'))
+            count = targets.filter(id__in=[r['id'] for r in rows]).update(status=Reservation.STATUS_CANCELLED)
+            if notify:
+                notifications.enqueue(notifications.cancellation_email(Reservation(**r)) for r in rows)
+            stats.mark_dirty(*{r['date'] for r in rows})
+            changes.record_many([r['id'] for r in rows], ReservationChange.ACTION_CANCELLED)
+        messages.success(request, f'{count} reservas canceladas.')
+
+    elif action == 'reschedule':
+        try:
+            days = int(request.POST.get('days', ''))
+        except ValueError:
+            days = 0
+        if not days:
+            messages.error(request, 'Indica cuántos días mover las reservas (por ejemplo 7 o -1).')
+            return redirect(back_url)
+        targets = selected.active()
+        with transaction.atomic():
+            rows = list(targets.select_for_update().values('id', 'name', 'email', 'date', 'time', 'offering__duration_minutes'))
+            now = datetime.now()
+            past = [r for r in rows if datetime.combine(r['date'] + timedelta(days=days), r['time']) < now]
+            if past:
+                messages.error(request, f'{len(past)} reservas quedarían en el pasado. No se ha movido ninguna.')
+                return redirect(back_url)
+            weekend = [r for r in rows if (r['date'] + timedelta(days=days)).weekday() in (5, 6)]
+            if weekend:
+                messages.error(request, f'{len(weekend)} reservas caerían en fin de semana. No se ha movido ninguna.')
+                return redirect(back_url)
+            conflicts = _find_conflicts(rows, days)
+            if conflicts:
+                names = ', '.join(f"{r['name']} ({r['date'] + timedelta(days=days)} {r['time'].strftime('%H:%M')})" for r in conflicts[:5])
+                messages.error(request, f'Se solaparían con otras reservas: {names}. No se ha movido ninguna.')
+                return redirect(back_url)
+            count = targets.filter(id__in=[r['id'] for r in rows]).update(
+                date=ExpressionWrapper(F('date') + timedelta(days=days), output_field=DateField())
+            )
+            if notify:
+                notifications.enqueue(
+                    notifications.reschedule_email(
+                        Reservation(name=r['name'], email=r['email'], date=r['date'] + timedelta(days=days), time=r['time']),
+                        r['date'],
+                    )
+                    for r in rows
+                )
+            stats.mark_dirty(*{r['date'] for r in rows}, *{r['date'] + timedelta(days=days) for r in rows})
+            changes.record_many([r['id'] for r in rows], ReservationChange.ACTION_UPDATED)
+        messages.success(request, f'{count} reservas movidas {days:+d} días.')
+
+    elif action == 'delete':
+        with transaction.atomic():
+            rows = list(selected.select_for_update().values('id', 'name', 'email', 'date', 'time', 'status'))
+            # The post_delete handlers only collect the touched days, change rows
+            # and search rows; each batch flushes them once when the block exits
+            with stats.stats_batch(), changes.changes_batch(), search.unindex_batch():
+                count, _ = Reservation.objects.filter(id__in=[r['id'] for r in rows]).delete()
+            if notify:
+                today = ddate.today()
+                notifications.enqueue(
+                    notifications.cancellation_email(Reservation(**r)) for r in rows
+                    if r['status'] == Reservation.STATUS_CONFIRMED and r['date'] >= today
+                )
+        messages.success(request, f'{count} reservas eliminadas.')
+
+    else:
+        messages.error(request, 'Acción no válida.')
+
+    return redirect(back_url)
+
+
 @user_passes_test(lambda u: u.is_staff)
 def delete_user(request, user_id):
     """Delete a user (admin only)."""
@@ -658,6 +1151,7 @@ Responde a este email para contactar directamente con {name}.
     return render(request, 'reservas/contacto.html', context)
 
 
+@cache_anonymous_page
 def faq(request):
     """FAQ page with collapsible questions and answers."""
     return render(request, 'reservas/faq.html')
@@ -0,0 +1,42 @@
+"""Precalentamiento de un worker recién arrancado.
+
+Compila todas las plantillas de `reservas/templates/reservas/` (con el loader
+cacheado de producción quedan en memoria) y carga el catálogo de ofertas, de
+modo que la primera petición de cada worker no paga ese coste. Se ejecuta
+desde `post_worker_init` en gunicorn.conf.py.
+"""
+import logging
+from pathlib import Path
+
+from django.db import DatabaseError, connections
+from django.template.loader import get_template
+
+from . import catalog
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).resolve().parent / 'templates'
+TEMPLATE_PREFIX = 'reservas'
+
+
+def template_names():
+    root = TEMPLATE_DIR / TEMPLATE_PREFIX
+    return sorted(path.relative_to(TEMPLATE_DIR).as_posix() for path in root.rglob('*.html'))
+
+
+def warm_up():
+    """Compile the app templates and prime the offering catalog.
+    Returns the number of templates compiled.
+    """
+    names = template_names()
+    for name in names:
+        get_template(name)
+    try:
+        catalog.offerings()
+    except DatabaseError:
+        # e.g. before the first migrate: the first request will load it
+        logger.warning('No se pudo precargar el catálogo de ofertas', exc_info=True)
+    finally:
+        # The worker may serve requests from other threads; don't keep this one's connection
+        connections.close_all()
+    return len(names)
@@ -0,0 +1,84 @@
+"""Benchmark local del renderizado de la portada con y sin fragmentos cacheados.
+
+Uso: python scripts/bench_home.py [--requests 200]
+
+Usa una base SQLite temporal con las ofertas de scripts/seed_offerings.py.
+Mide el tiempo de `views.home` (vista + plantilla, sin middleware) con la
+caché de fragmentos desactivada (como antes) y activada. El feed de YouTube
+se sustituye por una lista vacía para no medir la red.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'natursur.settings')
+
+import django
+from django.conf import settings
+
+tmpdir = tempfile.mkdtemp()
+settings.DATABASES['default'] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.path.join(tmpdir, 'bench.sqlite3')}
+settings.ALLOWED_HOSTS = ['testserver']
+django.setup()
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory
+
+from reservas import views
+from reservas.models import Offering
+
+OFFERINGS = [
+    ('sesion-40', "Sesión 40'", 40, '28.00'),
+    ('sesion-60', "Sesión 60'", 60, '45.00'),
+    ('sesion-90', "Sesión 90'", 90, '70.00'),
+    ('paquete-3x40', "3 sesiones de 40'", 40, '70.00'),
+    ('premium-60', "Sesión Premium 60'", 60, '50.00'),
+    ('domicilio-60', "Domicilio 60'", 60, '100.00'),
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=200)
+    return parser.parse_args()
+
+
+def measure(n):
+    factory = RequestFactory()
+    timings = []
+    for _ in range(n):
+        request = factory.get('/')
+        request.user = AnonymousUser()
+        started = time.perf_counter()
+        views.home(request)
+        timings.append((time.perf_counter() - started) * 1000)
+    # The first render warms the catalog and the fragments
+    return timings[1:]
+
+
+def report(label, timings):
+    timings = sorted(timings)
+    print(f'{label:<28} media: {statistics.mean(timings):.2f} ms  '
+          f'p50: {statistics.median(timings):.2f} ms  p95: {timings[int(len(timings) * 0.95) - 1]:.2f} ms')
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    call_command('migrate', verbosity=0)
+    for slug, name, minutes, price in OFFERINGS:
+        Offering.objects.create(slug=slug, name=name, duration_minutes=minutes, price_eur=Decimal(price))
+    cache.clear()
+    views._fetch_youtube_videos = lambda channel_id, limit=6: []
+
+    print(f'Peticiones: {args.requests}')
+    views.HOME_FRAGMENT_SECONDS = 0
+    report('Sin caché de fragmentos', measure(args.requests))
+    views.HOME_FRAGMENT_SECONDS = 24 * 3600
+    report('Con caché de fragmentos', measure(args.requests))
@@ -0,0 +1,92 @@
+"""Benchmark local de consultas SQL por petición según el motor de sesiones.
+
+Uso: python scripts/bench_sessions.py [--requests 50]
+
+Usa una base SQLite temporal y la caché en memoria. Para cada motor (db,
+cached_db, signed_cookies) recorre varias páginas como visitante anónimo y
+como usuario con sesión, con todo el middleware, y muestra las consultas
+medias por petición (todas las conexiones) y el tiempo medio. El feed de
+YouTube se sustituye por una lista vacía para no medir la red.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'natursur.settings')
+
+import django
+from django.conf import settings
+
+tmpdir = tempfile.mkdtemp()
+settings.DATABASES['default'] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.path.join(tmpdir, 'bench.sqlite3')}
+# Single connection: the read-only SQLite alias would point at the real db.sqlite3
+settings.DATABASES.pop('readonly', None)
+settings.READ_DATABASE_ALIAS = None
+settings.ALLOWED_HOSTS = ['testserver']
+django.setup()
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from natursur.sessions import SESSION_ENGINES
+from reservas import views
+
+ENGINES = ('db', 'cached_db', 'signed_cookies')
+ANONYMOUS_PAGES = ('/', '/faq/')
+LOGGED_IN_PAGES = ('/', '/faq/', '/mis-reservas/')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=50)
+    return parser.parse_args()
+
+
+def measure(client, paths, n):
+    queries, timings = [], []
+    for _ in range(n):
+        for path in paths:
+            with ExitStack() as stack:
+                contexts = [stack.enter_context(CaptureQueriesContext(conn)) for conn in connections.all()]
+                started = time.perf_counter()
+                response = client.get(path)
+                timings.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, (path, response.status_code)
+            queries.append(sum(len(c.captured_queries) for c in contexts))
+    return statistics.mean(queries), statistics.mean(timings)
+
+
+def run(engine, n):
+    with override_settings(SESSION_ENGINE=SESSION_ENGINES[engine]):
+        cache.clear()
+        anonymous = Client()
+        # Warm-up: catalog, fragments and the CSRF cookie
+        measure(anonymous, ANONYMOUS_PAGES, 1)
+        anon = measure(anonymous, ANONYMOUS_PAGES, n)
+        user = Client()
+        user.login(username='bench', password='bench-pass-123')
+        measure(user, LOGGED_IN_PAGES, 1)
+        logged = measure(user, LOGGED_IN_PAGES, n)
+    print(f'{engine:<16} anónimo: {anon[0]:.1f} consultas, {anon[1]:.2f} ms   '
+          f'con sesión: {logged[0]:.1f} consultas, {logged[1]:.2f} ms')
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    call_command('migrate', verbosity=0)
+    User.objects.create_user(username='bench', password='bench-pass-123', email='bench@example.com')
+    views._fetch_youtube_videos = lambda channel_id, limit=6: []
+
+    print(f'Peticiones por página: {args.requests} (anónimo: {", ".join(ANONYMOUS_PAGES)}; '
+          f'con sesión: {", ".join(LOGGED_IN_PAGES)})')
+    for engine in ENGINES:
+        run(engine, args.requests)
@@ -0,0 +1,122 @@
+"""Benchmark local de SQLite con varios workers: ajustes por defecto vs. ajustados.
+
+Uso: python scripts/bench_sqlite.py [--workers 4] [--seconds 5] [--write-ratio 0.2]
+
+Cada worker es un proceso (como un worker de gunicorn) que mezcla consultas de
+disponibilidad con reservas nuevas (validación del formulario + save, con sus
+señales). Se ejecuta dos veces sobre ficheros temporales: con SQLITE_TUNING=False
+(modo journal por defecto) y con SQLITE_TUNING=True (WAL, pragmas y alias de
+solo lectura para las consultas). No toca db.sqlite3.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, time as dtime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django(db_path, tuned):
+    sys.path.insert(0, ROOT)
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'natursur.settings'
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    os.environ['SQLITE_TUNING'] = 'True' if tuned else 'False'
+    import django
+    django.setup()
+
+
+def prepare(db_path, tuned):
+    subprocess.run(
+        [sys.executable, os.path.join(ROOT, 'manage.py'), 'migrate', '-v0'],
+        check=True,
+        env={**os.environ, 'DATABASE_URL': f'sqlite:///{db_path}', 'SQLITE_TUNING': str(tuned)},
+    )
+
+
+def weekdays(n):
+    day = date.today() + timedelta(days=7)
+    days = []
+    while len(days) < n:
+        if day.weekday() < 5:
+            days.append(day)
+        day += timedelta(days=1)
+    return days
+
+
+def worker(db_path, tuned, seconds, write_ratio, seed, results):
+    setup_django(db_path, tuned)
+    from django.db import OperationalError, close_old_connections
+    from natursur.database import READONLY_ALIAS, use_read_alias
+    from reservas.forms import ReservationForm
+    from reservas.models import Reservation
+
+    rng = random.Random(seed)
+    days = weekdays(60)
+    slots = [dtime(h, m) for h in range(9, 17) for m in (0, 30)]
+    counts = {'reads': 0, 'writes': 0, 'locked': 0}
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if rng.random() < write_ratio:
+                form = ReservationForm({
+                    'name': 'Bench', 'email': f'bench{seed}@example.com', 'phone': '600000000',
+                    'date': rng.choice(days).isoformat(), 'time': rng.choice(slots).strftime('%H:%M'),
+                })
+                if form.is_valid():
+                    form.save()
+                counts['writes'] += 1
+            else:
+                with use_read_alias(READONLY_ALIAS):
+                    list(Reservation.objects.active().filter(date=rng.choice(days)).select_related('offering'))
+                counts['reads'] += 1
+        except OperationalError as exc:
+            if 'locked' not in str(exc):
+                raise
+            counts['locked'] += 1
+        latencies.append(time.perf_counter() - started)
+        # Like the end of a request
+        close_old_connections()
+    latencies.sort()
+    counts['p95_ms'] = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0
+    results.put(counts)
+
+
+def run(tuned, args):
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    prepare(db_path, tuned)
+    ctx = multiprocessing.get_context('spawn')
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=worker, args=(db_path, tuned, args.seconds, args.write_ratio, i, results))
+        for i in range(args.workers)
+    ]
+    for p in procs:
+        p.start()
+    totals = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    reads = sum(t['reads'] for t in totals)
+    writes = sum(t['writes'] for t in totals)
+    locked = sum(t['locked'] for t in totals)
+    p95 = max(t['p95_ms'] for t in totals)
+    label = 'ajustado (WAL)' if tuned else 'por defecto   '
+    print(f'{label}  lecturas/s: {reads / args.seconds:7.0f}  escrituras/s: {writes / args.seconds:6.0f}  '
+          f'"database is locked": {locked:4d}  p95: {p95:6.1f} ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    args = parser.parse_args()
+    print(f'{args.workers} workers, {args.seconds:g} s, {args.write_ratio:.0%} escrituras')
+    run(False, args)
+    run(True, args)
@@ -0,0 +1,113 @@
+"""Benchmark local del panel en directo: N empleados conectados al SSE.
+
+Uso: python scripts/bench_sse.py [--clients 50] [--changes 20]
+
+Usa una base SQLite temporal (no toca db.sqlite3). Abre N streams con el
+AsyncClient de Django, guarda reservas y mide cuánto tarda cada cambio en
+llegar a todos los clientes y cuántas consultas al registro de cambios hizo
+el sondeo compartido.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, time as dtime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'natursur.settings')
+
+import django
+from django.conf import settings
+
+tmpdir = tempfile.mkdtemp()
+settings.DATABASES['default'] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.path.join(tmpdir, 'bench.sqlite3')}
+settings.ALLOWED_HOSTS = ['testserver']
+django.setup()
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import AsyncClient
+
+from reservas import events
+from reservas.models import Reservation
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--changes', type=int, default=20)
+    return parser.parse_args()
+
+
+def create_reservation(i):
+    day = date.today() + timedelta(days=30 + i)
+    r = Reservation.objects.create(
+        name=f'Bench {i}', email=f'bench{i}@example.com', phone='600000000',
+        date=day, time=dtime(10, 0),
+    )
+    return r.id
+
+
+async def listen(client, received, expected, ready):
+    response = await client.get('/panel/api/reservas/eventos/')
+    ready.release()
+    if not response.streaming:
+        raise SystemExit(f'El endpoint respondió {response.status_code}')
+    async for chunk in response.streaming_content:
+        text = chunk.decode() if isinstance(chunk, bytes) else chunk
+        for line in text.splitlines():
+            if line.startswith('data: '):
+                received.append(time.perf_counter())
+        if len(received) >= expected:
+            return
+
+
+async def main(args, cookies):
+    events.POLL_SECONDS = 0.2
+    ready = asyncio.Semaphore(0)
+    inboxes = [[] for _ in range(args.clients)]
+    clients = []
+    for _ in range(args.clients):
+        client = AsyncClient()
+        client.cookies = cookies
+        clients.append(client)
+
+    started = time.perf_counter()
+    tasks = [asyncio.ensure_future(listen(c, inbox, args.changes, ready)) for c, inbox in zip(clients, inboxes)]
+    for _ in range(args.clients):
+        await ready.acquire()
+    connect_time = time.perf_counter() - started
+
+    polls_before = events.get_broadcaster().polls
+    sent = []
+    for i in range(args.changes):
+        sent.append(time.perf_counter())
+        await sync_to_async(create_reservation)(i)
+        await asyncio.sleep(0.05)
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=60)
+    elapsed = time.perf_counter() - sent[0]
+    polls = events.get_broadcaster().polls - polls_before
+
+    latencies = [(got - sent[n]) * 1000 for inbox in inboxes for n, got in enumerate(inbox)]
+    latencies.sort()
+    print(f'Clientes: {args.clients}  Cambios: {args.changes}')
+    print(f'Conexión de todos los clientes: {connect_time * 1000:.0f} ms')
+    print(f'Eventos entregados: {len(latencies)} de {args.clients * args.changes}')
+    print(f'Latencia p50: {statistics.median(latencies):.0f} ms  '
+          f'p95: {latencies[int(len(latencies) * 0.95) - 1]:.0f} ms  max: {latencies[-1]:.0f} ms')
+    print(f'Sondeos del registro de cambios: {polls} en {elapsed:.1f} s '
+          f'(sin sondeo compartido serían ~{polls * args.clients})')
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    call_command('migrate', verbosity=0)
+    staff = get_user_model().objects.create_user('bench', password='x', is_staff=True)
+    from django.test import Client
+    login = Client()
+    login.force_login(staff)
+    asyncio.run(main(args, login.cookies))
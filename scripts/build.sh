@@ -0,0 +1,23 @@
+#!/usr/bin/env bash
+# Build step for production (e.g. Render "Build Command": ./scripts/build.sh)
+# Installs dependencies, generates the responsive image variants, builds the
+# minified CSS/JS bundles and the home critical CSS, and collects
+# static files with hashed names and pre-compressed .gz/.br copies
+# (STORAGES when DEBUG=False).
+
+set -euo pipefail
+
+ROOT_DIR="$(cd "$(dirname "$0")/.." && pwd)"
+cd "$ROOT_DIR"
+
+echo "[*] Installing dependencies..."
+pip install -r requirements.txt
+
+echo "[*] Generating responsive image variants..."
+python3 manage.py generate_responsive_images
+
+echo "[*] Building CSS/JS bundles..."
+python3 manage.py build_assets
+
+echo "[*] Collecting static files..."
+DEBUG=False python3 manage.py collectstatic --noinput